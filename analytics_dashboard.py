@@ -9,9 +9,14 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
+from itertools import chain
 import os
 
-@dataclass
+# Default store, and the whole-document file earlier versions kept there
+DEFAULT_ANALYTICS_FILE = "analytics_data.jsonl"
+LEGACY_ANALYTICS_FILE = "analytics_data.json"
+
+@dataclass(slots=True, frozen=True)
 class SystemMetrics:
     """System-wide performance metrics"""
     
@@ -40,7 +45,7 @@ class SystemMetrics:
     satisfaction_rate: float
     feedback_count: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalyticsInsight:
     """Represents an analytical insight"""
     
@@ -56,10 +61,20 @@ class AnalyticsInsight:
 class AdvancedAnalytics:
     """Advanced analytics and insights system"""
     
-    def __init__(self, data_file: str = "analytics_data.json"):
-        self.data_file = data_file
+    def __init__(self, data_file: str = DEFAULT_ANALYTICS_FILE):
+        # Events are stored as JSON Lines; a .json name from older versions
+        # is read once as the legacy file and migrated to the .jsonl next to it.
+        # Any other name is used as given, with no legacy file
+        root, ext = os.path.splitext(data_file)
+        if ext == '.json':
+            self.data_file, self.legacy_data_file = root + '.jsonl', data_file
+        elif data_file == DEFAULT_ANALYTICS_FILE:
+            self.data_file, self.legacy_data_file = data_file, LEGACY_ANALYTICS_FILE
+        else:
+            self.data_file, self.legacy_data_file = data_file, None
         self.metrics_history: List[Dict[str, Any]] = []
         self.insights_cache: List[AnalyticsInsight] = []
+        self._rewrite_needed = False  # File must be rewritten before appending
         self.load_analytics_data()
     
     def record_processing_event(self, 
@@ -84,7 +99,7 @@ class AdvancedAnalytics:
         }
         
         self.metrics_history.append(event)
-        self.save_analytics_data()
+        self.append_analytics_event(event)
         
         # Generate insights if enough data
         if len(self.metrics_history) % 10 == 0:  # Every 10 events
@@ -105,9 +120,9 @@ class AdvancedAnalytics:
         unique_sessions = len(set(e['session_id'] for e in recent_events))
         avg_requests_per_session = total_requests / unique_sessions if unique_sessions > 0 else 0
         
-        # Performance metrics
+        # Performance metrics (fmean sums in C; statistics.mean goes through exact fractions)
         processing_times = [e['processing_time'] for e in recent_events]
-        avg_processing_time = statistics.mean(processing_times)
+        avg_processing_time = statistics.fmean(processing_times)
         min_processing_time = min(processing_times)
         max_processing_time = max(processing_times)
         
@@ -116,7 +131,7 @@ class AdvancedAnalytics:
         
         # Quality metrics
         quality_scores = [e['quality_score'] for e in recent_events if e['quality_score'] > 0]
-        avg_quality_score = statistics.mean(quality_scores) if quality_scores else 0
+        avg_quality_score = statistics.fmean(quality_scores) if quality_scores else 0
         
         quality_distribution = self._calculate_quality_distribution(quality_scores)
         improvement_success_rate = self._calculate_improvement_success_rate(recent_events)
@@ -129,7 +144,7 @@ class AdvancedAnalytics:
         feedback_events = [e for e in recent_events if e.get('user_feedback')]
         if feedback_events:
             ratings = [e['user_feedback']['rating'] for e in feedback_events if 'rating' in e['user_feedback']]
-            avg_user_rating = statistics.mean(ratings) if ratings else 0
+            avg_user_rating = statistics.fmean(ratings) if ratings else 0
             satisfaction_rate = len([r for r in ratings if r >= 4]) / len(ratings) if ratings else 0
         else:
             avg_user_rating = 0
@@ -179,13 +194,7 @@ class AdvancedAnalytics:
     def _calculate_agent_usage(self, events: List[Dict[str, Any]]) -> Dict[str, int]:
         """Calculate agent usage statistics"""
         
-        agent_counter = Counter()
-        
-        for event in events:
-            for agent in event['agents_used']:
-                agent_counter[agent] += 1
-        
-        return dict(agent_counter)
+        return dict(Counter(chain.from_iterable(event['agents_used'] for event in events)))
     
     def _calculate_agent_performance(self, events: List[Dict[str, Any]]) -> Dict[str, float]:
         """Calculate agent performance metrics"""
@@ -200,7 +209,7 @@ class AdvancedAnalytics:
         
         # Calculate average performance
         return {
-            agent: statistics.mean(scores)
+            agent: statistics.fmean(scores)
             for agent, scores in agent_performance.items()
         }
     
@@ -258,7 +267,7 @@ class AdvancedAnalytics:
         
         # Processing time analysis
         processing_times = [e['processing_time'] for e in recent_events]
-        avg_time = statistics.mean(processing_times)
+        avg_time = statistics.fmean(processing_times)
         
         # Identify slow processing
         if avg_time > 3.0:
@@ -275,7 +284,7 @@ class AdvancedAnalytics:
         
         # Cache performance (if data available)
         knowledge_usage = [e['knowledge_guidelines_used'] for e in recent_events]
-        avg_knowledge_usage = statistics.mean(knowledge_usage)
+        avg_knowledge_usage = statistics.fmean(knowledge_usage)
         
         if avg_knowledge_usage > 3:
             insights.append(AnalyticsInsight(
@@ -302,7 +311,7 @@ class AdvancedAnalytics:
         
         # Quality trend
         quality_scores = [e['quality_score'] for e in recent_events]
-        avg_quality = statistics.mean(quality_scores)
+        avg_quality = statistics.fmean(quality_scores)
         
         if avg_quality >= 0.85:
             insights.append(AnalyticsInsight(
@@ -329,7 +338,7 @@ class AdvancedAnalytics:
         
         # Improvement effectiveness
         improvements_per_request = [e['improvements_count'] for e in recent_events]
-        avg_improvements = statistics.mean(improvements_per_request)
+        avg_improvements = statistics.fmean(improvements_per_request)
         
         if avg_improvements > 5:
             insights.append(AnalyticsInsight(
@@ -421,8 +430,8 @@ class AdvancedAnalytics:
         values = [item[1] for item in sorted_data]
         
         # Simple linear trend
-        first_third = statistics.mean(values[:len(values)//3])
-        last_third = statistics.mean(values[-len(values)//3:])
+        first_third = statistics.fmean(values[:len(values)//3])
+        last_third = statistics.fmean(values[-len(values)//3:])
         
         change_percent = ((last_third - first_third) / first_third * 100) if first_third > 0 else 0
         
@@ -553,7 +562,7 @@ class AdvancedAnalytics:
         for day, scores in sorted(daily_quality.items()):
             chart_data.append({
                 'date': day,
-                'quality': statistics.mean(scores),
+                'quality': statistics.fmean(scores),
                 'count': len(scores)
             })
         
@@ -616,29 +625,54 @@ class AdvancedAnalytics:
             return ""
     
     def load_analytics_data(self) -> None:
-        """Load analytics data from file"""
-        if os.path.exists(self.data_file):
+        """Load analytics data from file (JSON Lines, or a single JSON document from older versions)"""
+        path = self.data_file
+        if not os.path.exists(path) and self.legacy_data_file and os.path.exists(self.legacy_data_file):
+            path = self.legacy_data_file
+        
+        if os.path.exists(path):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
                 
-                self.metrics_history = data.get('metrics_history', [])
+                try:
+                    data = json.loads(content)
+                    # A whole-file document is the old format; rewrite it before appending
+                    self._rewrite_needed = 'metrics_history' in data
+                    self.metrics_history = data['metrics_history'] if self._rewrite_needed else [data]
+                except json.JSONDecodeError:
+                    self.metrics_history = [json.loads(line) for line in content.splitlines() if line.strip()]
                 print(f"Loaded {len(self.metrics_history)} analytics events")
+                
+                # Migrate a legacy file once; later loads read the .jsonl file
+                if path != self.data_file:
+                    self.save_analytics_data()
+                    print(f"Migrated {path} to {self.data_file}")
             except Exception as e:
                 print(f"Error loading analytics data: {e}")
                 self.metrics_history = []
+                self._rewrite_needed = True
         else:
             self.metrics_history = []
     
     def save_analytics_data(self) -> None:
-        """Save analytics data to file"""
+        """Rewrite the whole analytics file, one JSON event per line"""
         try:
-            data = {
-                'metrics_history': self.metrics_history,
-                'last_updated': time.time()
-            }
             with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.writelines(json.dumps(event, ensure_ascii=False) + '\n' for event in self.metrics_history)
+            self._rewrite_needed = False
+        except Exception as e:
+            print(f"Error saving analytics data: {e}")
+    
+    def append_analytics_event(self, event: Dict[str, Any]) -> None:
+        """Append one event to the analytics file without rewriting earlier ones"""
+        if self._rewrite_needed:
+            self.save_analytics_data()
+            return
+        
+        try:
+            with open(self.data_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
         except Exception as e:
             print(f"Error saving analytics data: {e}")
 
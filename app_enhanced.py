@@ -5,7 +5,9 @@ import os
 import sys
 
 # Add the current directory to the path so we can import our modules
-sys.path.append(os.path.dirname(__file__))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:  # Already first when run as a script
+    sys.path.insert(0, _HERE)
 
 from agent_coordinator import AgentCoordinator
 
@@ -4,14 +4,18 @@ User feedback integration system for continuous improvement
 
 import json
 import time
-import uuid
+import secrets
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict
 import os
 
-@dataclass
+# Default store, and the whole-document file earlier versions kept there
+DEFAULT_FEEDBACK_FILE = "feedback_data.jsonl"
+LEGACY_FEEDBACK_FILE = "feedback_data.json"
+
+@dataclass(slots=True, frozen=True)
 class UserFeedback:
     """Represents user feedback on text processing results"""
     id: str
@@ -27,7 +31,7 @@ class UserFeedback:
     user_corrections: Optional[Dict[str, str]] = None  # User's manual corrections
     improvement_areas: Optional[List[str]] = None  # Areas user wants improved
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FeedbackAnalytics:
     """Analytics derived from user feedback"""
     total_feedback: int
@@ -41,9 +45,19 @@ class FeedbackAnalytics:
 class UserFeedbackManager:
     """Manages collection and analysis of user feedback"""
     
-    def __init__(self, feedback_file: str = "feedback_data.json"):
-        self.feedback_file = feedback_file
+    def __init__(self, feedback_file: str = DEFAULT_FEEDBACK_FILE):
+        # Feedback is stored as JSON Lines; a .json name from older versions
+        # is read once as the legacy file and migrated to the .jsonl next to it.
+        # Any other name is used as given, with no legacy file
+        root, ext = os.path.splitext(feedback_file)
+        if ext == '.json':
+            self.feedback_file, self.legacy_feedback_file = root + '.jsonl', feedback_file
+        elif feedback_file == DEFAULT_FEEDBACK_FILE:
+            self.feedback_file, self.legacy_feedback_file = feedback_file, LEGACY_FEEDBACK_FILE
+        else:
+            self.feedback_file, self.legacy_feedback_file = feedback_file, None
         self.feedback_data: List[UserFeedback] = []
+        self._rewrite_needed = False  # File must be rewritten before appending
         self.load_feedback_data()
         
         # Feedback categories for analysis
@@ -69,7 +83,7 @@ class UserFeedbackManager:
                         improvement_areas: Optional[List[str]] = None) -> str:
         """Collect user feedback"""
         
-        feedback_id = str(uuid.uuid4())
+        feedback_id = secrets.token_hex(16)
         
         feedback = UserFeedback(
             id=feedback_id,
@@ -87,7 +101,7 @@ class UserFeedbackManager:
         )
         
         self.feedback_data.append(feedback)
-        self.save_feedback_data()
+        self.append_feedback_data([feedback])
         
         print(f"Feedback collected: {feedback_id}")
         return feedback_id
@@ -355,28 +369,59 @@ class UserFeedbackManager:
             return ""
     
     def load_feedback_data(self) -> None:
-        """Load feedback data from file"""
-        if os.path.exists(self.feedback_file):
+        """Load feedback data from file (JSON Lines, or a JSON array from older versions)"""
+        path = self.feedback_file
+        if not os.path.exists(path) and self.legacy_feedback_file and os.path.exists(self.legacy_feedback_file):
+            path = self.legacy_feedback_file
+        
+        if os.path.exists(path):
             try:
-                with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                try:
+                    data = json.loads(content)
+                    # A whole-file array is the old format; rewrite it before appending
+                    self._rewrite_needed = isinstance(data, list)
+                    if not self._rewrite_needed:
+                        data = [data]
+                except json.JSONDecodeError:
+                    data = [json.loads(line) for line in content.splitlines() if line.strip()]
                 
                 self.feedback_data = [
                     UserFeedback(**item) for item in data
                 ]
                 print(f"Loaded {len(self.feedback_data)} feedback entries")
+                
+                # Migrate a legacy file once; later loads read the .jsonl file
+                if path != self.feedback_file:
+                    self.save_feedback_data()
+                    print(f"Migrated {path} to {self.feedback_file}")
             except Exception as e:
                 print(f"Error loading feedback data: {e}")
                 self.feedback_data = []
+                self._rewrite_needed = True
         else:
             self.feedback_data = []
     
     def save_feedback_data(self) -> None:
-        """Save feedback data to file"""
+        """Rewrite the whole feedback file, one JSON record per line"""
         try:
-            data = [asdict(feedback) for feedback in self.feedback_data]
             with open(self.feedback_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.writelines(json.dumps(asdict(feedback), ensure_ascii=False) + '\n' for feedback in self.feedback_data)
+            self._rewrite_needed = False
+        except Exception as e:
+            print(f"Error saving feedback data: {e}")
+    
+    def append_feedback_data(self, entries: List[UserFeedback]) -> None:
+        """Append new entries to the feedback file without rewriting earlier ones"""
+        if self._rewrite_needed:
+            self.save_feedback_data()
+            return
+        
+        try:
+            with open(self.feedback_file, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(asdict(feedback), ensure_ascii=False) + '\n' for feedback in entries)
         except Exception as e:
             print(f"Error saving feedback data: {e}")
     
@@ -396,52 +441,52 @@ class UserFeedbackManager:
         agents = [['grammar'], ['style'], ['grammar', 'style'], ['seo'], ['grammar', 'style', 'seo']]
         feedback_types = ['correction', 'suggestion', 'praise', 'complaint']
         
-        for i in range(num_entries):
-            session_id = f"sim_session_{i}"
-            original = random.choice(sample_texts)
-            processed = original  # Simplified
-            rating = random.choices([1, 2, 3, 4, 5], weights=[0.05, 0.1, 0.2, 0.4, 0.25])[0]
-            feedback_type = random.choice(feedback_types)
-            
-            # Generate feedback text based on rating
-            if rating >= 4:
-                feedback_text = random.choice([
-                    "Excelente corrección, muy útil",
-                    "Me ayudó mucho a mejorar mi texto", 
-                    "Las sugerencias son muy apropiadas"
-                ])
-            elif rating == 3:
-                feedback_text = random.choice([
-                    "Está bien pero podría mejorar",
-                    "Algunas sugerencias son útiles",
-                    "Regular, cumple su función"
-                ])
-            else:
-                feedback_text = random.choice([
-                    "Las correcciones no son precisas",
-                    "El sistema es muy lento",
-                    "No entiendo las explicaciones"
-                ])
-            
-            # Random timestamp within last 30 days
-            timestamp = time.time() - random.randint(0, 30 * 24 * 3600)
-            
-            feedback = UserFeedback(
-                id=str(uuid.uuid4()),
-                session_id=session_id,
+        # Feedback text based on rating
+        positive = [
+            "Excelente corrección, muy útil",
+            "Me ayudó mucho a mejorar mi texto", 
+            "Las sugerencias son muy apropiadas"
+        ]
+        neutral = [
+            "Está bien pero podría mejorar",
+            "Algunas sugerencias son útiles",
+            "Regular, cumple su función"
+        ]
+        negative = [
+            "Las correcciones no son precisas",
+            "El sistema es muy lento",
+            "No entiendo las explicaciones"
+        ]
+        feedback_texts = {5: positive, 4: positive, 3: neutral, 2: negative, 1: negative}
+        
+        first_new = len(self.feedback_data)
+        
+        # Draw every random field in one call per column instead of once per entry
+        originals = random.choices(sample_texts, k=num_entries)
+        ratings = random.choices([1, 2, 3, 4, 5], weights=[0.05, 0.1, 0.2, 0.4, 0.25], k=num_entries)
+        types = random.choices(feedback_types, k=num_entries)
+        agents_used = random.choices(agents, k=num_entries)
+        ages = random.choices(range(30 * 24 * 3600 + 1), k=num_entries)  # Within last 30 days
+        now = time.time()
+        
+        self.feedback_data.extend(
+            UserFeedback(
+                id=secrets.token_hex(16),
+                session_id=f"sim_session_{i}",
                 original_text=original,
-                processed_text=processed,
+                processed_text=original,  # Simplified
                 user_rating=rating,
                 feedback_type=feedback_type,
-                specific_feedback=feedback_text,
-                agent_used=random.choice(agents),
+                specific_feedback=random.choice(feedback_texts[rating]),
+                agent_used=agent_used,
                 processing_time=random.uniform(0.5, 5.0),
-                timestamp=timestamp
+                timestamp=now - age
             )
-            
-            self.feedback_data.append(feedback)
+            for i, (original, rating, feedback_type, agent_used, age)
+            in enumerate(zip(originals, ratings, types, agents_used, ages))
+        )
         
-        self.save_feedback_data()
+        self.append_feedback_data(self.feedback_data[first_new:])
         print(f"Generated {num_entries} simulated feedback entries")
 
 class FeedbackIntegratedCoordinator:
@@ -450,7 +495,7 @@ class FeedbackIntegratedCoordinator:
     def __init__(self, base_coordinator, feedback_manager: UserFeedbackManager):
         self.base_coordinator = base_coordinator
         self.feedback_manager = feedback_manager
-        self.session_id = str(uuid.uuid4())
+        self.session_id = secrets.token_hex(8)
     
     def process_text_with_feedback(self, text: str, selected_agents: List[str] = None) -> Dict[str, Any]:
         """Process text and prepare for feedback collection"""
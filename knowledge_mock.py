@@ -3,6 +3,15 @@ Mock knowledge base system for Phase 3 demonstration
 Uses pre-extracted content instead of PDF processing
 """
 
+import re
+from functools import lru_cache
+
+# Words of guideline contents and search keywords; punctuation is not part of a word
+WORD_RE = re.compile(r'\w+')
+
+# Distinct keywords whose matching guidelines are remembered
+KEYWORD_CACHE_SIZE = 1024
+
 class MockKnowledgeBase:
     """Mock knowledge base with pre-defined Spanish language guidelines"""
     
@@ -80,6 +89,25 @@ class MockKnowledgeBase:
                 }
             ]
         }
+        
+        # Inverted index over the static guidelines, built once
+        self._build_index()
+    
+    def _build_index(self):
+        """Map every lowercase content word to the guidelines that contain it"""
+        self._indexed_guidelines = [g for guidelines in self.guidelines.values() for g in guidelines]
+        self._word_index = {}
+        for position, guideline in enumerate(self._indexed_guidelines):
+            for word in WORD_RE.findall(guideline["content"].lower()):
+                self._word_index.setdefault(word, set()).add(position)
+        self._guidelines_matching = lru_cache(maxsize=KEYWORD_CACHE_SIZE)(self._match_keyword)
+    
+    def _match_keyword(self, keyword):
+        """Positions of the guidelines that contain every word of the keyword"""
+        words = WORD_RE.findall(keyword.lower())
+        if not words:
+            return frozenset()
+        return frozenset.intersection(*(frozenset(self._word_index.get(word, ())) for word in words))
     
     def get_relevant_guidelines(self, text, agent_type, issues=None, n_results=3):
         """Get relevant guidelines based on agent type and issues"""
@@ -116,16 +144,15 @@ class MockKnowledgeBase:
     
     def search_by_keywords(self, keywords, n_results=3):
         """Search guidelines by keywords"""
-        results = []
-        
-        for category, guidelines in self.guidelines.items():
-            for guideline in guidelines:
-                # Simple keyword matching
-                content_lower = guideline["content"].lower()
-                if any(keyword.lower() in content_lower for keyword in keywords):
-                    results.append(guideline)
+        # Count matched keywords per guideline through the index
+        match_counts = {}
+        for keyword in set(k.lower() for k in keywords):
+            for position in self._guidelines_matching(keyword):
+                match_counts[position] = match_counts.get(position, 0) + 1
         
-        return results[:n_results]
+        # Guidelines matching more keywords first, ties in knowledge base order
+        ranked = sorted(match_counts, key=lambda position: (-match_counts[position], position))
+        return [self._indexed_guidelines[position] for position in ranked[:n_results]]
 
 class MockVectorStore:
     """Mock vector store for compatibility"""
@@ -2,12 +2,22 @@
 Multi-pass refinement system for iterative text improvement
 """
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+import re
 import time
 from dataclasses import dataclass
 from agent_coordinator import AgentCoordinator
+from performance_optimizer import NS_PER_SECOND
 
-@dataclass
+# Sentence boundary: whitespace after a terminator, captured so splitting
+# keeps the separators (spaces, newlines, paragraph breaks)
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])(\s+)')
+
+# Stop reasons that mean the text converged rather than ran out of passes
+QUALITY_THRESHOLD_REASON = "Quality threshold reached"
+CONVERGENCE_REASON = "Convergence detected"
+
+@dataclass(slots=True, frozen=True)
 class RefinementPass:
     """Represents a single refinement pass"""
     pass_number: int
@@ -21,11 +31,20 @@ class RefinementPass:
 class MultiPassProcessor:
     """Handles multi-pass iterative text refinement"""
     
-    def __init__(self, coordinator: AgentCoordinator, max_passes: int = 3):
+    # Defaults; mode-specific subclasses override these as class constants
+    max_passes = 3
+    convergence_threshold = 0.05  # Stop if improvement < 5%
+    min_quality_threshold = 0.85  # Stop if quality > 85%
+    
+    def __init__(self, coordinator: AgentCoordinator, max_passes: Optional[int] = None, patience: int = 2,
+                 sentence_level: bool = False):
         self.coordinator = coordinator
-        self.max_passes = max_passes
-        self.convergence_threshold = 0.05  # Stop if improvement < 5%
-        self.min_quality_threshold = 0.85  # Stop if quality > 85%
+        if max_passes is not None:
+            self.max_passes = max_passes
+        self.patience = max(1, patience)  # Passes without a quality gain before stopping
+        self.sentence_level = sentence_level  # Process sentence by sentence, reusing stable ones
+        self._best_quality = 0.0
+        self._passes_without_gain = 0
         
     def process_with_multiple_passes(self, 
                                    text: str, 
@@ -36,20 +55,27 @@ class MultiPassProcessor:
         passes = []
         current_text = text
         previous_quality = 0.0
-        total_start_time = time.time()
+        total_start_ns = time.perf_counter_ns()
+        self._best_quality = 0.0
+        self._passes_without_gain = 0
+        sentence_results: Dict[str, Dict[str, Any]] = {}
+        stop_reason = None
         
         print(f"🔄 Starting multi-pass processing (max {self.max_passes} passes)")
         
         for pass_num in range(1, self.max_passes + 1):
             print(f"   Pass {pass_num}: Processing...")
-            pass_start_time = time.time()
+            pass_start_ns = time.perf_counter_ns()
             
             # Process current text
-            results = self.coordinator.process_text(current_text, selected_agents)
+            if self.sentence_level:
+                results = self._process_by_sentence(current_text, selected_agents, sentence_results)
+            else:
+                results = self.coordinator.process_text(current_text, selected_agents)
             
             # Calculate metrics for this pass
             quality_score = results.get('final_validation', {}).get('quality_score', 0.0)
-            processing_time = time.time() - pass_start_time
+            processing_time = (time.perf_counter_ns() - pass_start_ns) / NS_PER_SECOND
             
             # Create pass record
             current_pass = RefinementPass(
@@ -66,6 +92,14 @@ class MultiPassProcessor:
             
             passes.append(current_pass)
             
+            # A pass gains only if it beats the best score so far by the
+            # threshold, so a slow drift upwards still counts as converged
+            if pass_num == 1 or quality_score >= self._best_quality + self.convergence_threshold:
+                self._best_quality = quality_score
+                self._passes_without_gain = 0
+            else:
+                self._passes_without_gain += 1
+            
             # Check convergence conditions
             should_continue, reason = self._should_continue_processing(
                 current_pass, previous_quality, pass_num
@@ -75,20 +109,68 @@ class MultiPassProcessor:
             
             if not should_continue:
                 print(f"   🛑 Stopping: {reason}")
+                stop_reason = reason
                 break
             
             # Prepare for next pass
             current_text = results['corrected_text']
             previous_quality = quality_score
         
-        total_time = time.time() - total_start_time
+        total_time = (time.perf_counter_ns() - total_start_ns) / NS_PER_SECOND
+        
+        # Only a quality or convergence stop counts; an unchanged pass or an
+        # exhausted budget doesn't
+        converged = stop_reason is not None and stop_reason.startswith((QUALITY_THRESHOLD_REASON, CONVERGENCE_REASON))
         
         # Compile final results
-        final_results = self._compile_multi_pass_results(passes, total_time, user_preferences)
+        final_results = self._compile_multi_pass_results(passes, total_time, user_preferences, converged, stop_reason)
         
         print(f"✅ Multi-pass completed: {len(passes)} passes, {total_time:.1f}s")
         return final_results
     
+    def _process_by_sentence(self,
+                             text: str,
+                             selected_agents: List[str],
+                             sentence_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Process each sentence separately, reusing earlier results for unchanged sentences"""
+        
+        stripped = text.strip()
+        if not stripped:
+            return self.coordinator.process_text(text, selected_agents)
+        
+        # Sentences alternate with their separators; the surrounding whitespace
+        # and every separator are put back unchanged so the layout survives
+        parts = SENTENCE_SPLIT_RE.split(stripped)
+        leading = text[:len(text) - len(text.lstrip())]
+        sentences, separators = parts[::2], parts[1::2] + [text[len(text.rstrip()):]]
+        
+        # Sentences the previous pass left untouched are looked up, not resent
+        # to the agents; processing is deterministic so the result is the same
+        per_sentence = []
+        for sentence in sentences:
+            results = sentence_results.get(sentence)
+            if results is None:
+                results = sentence_results[sentence] = self.coordinator.process_text(sentence, selected_agents)
+            per_sentence.append((sentence, results))
+        
+        # Pass quality is the word-weighted mean of the sentence scores
+        weights = [len(sentence.split()) or 1 for sentence, _ in per_sentence]
+        quality_score = sum(
+            weight * results.get('final_validation', {}).get('quality_score', 0.0)
+            for weight, (_, results) in zip(weights, per_sentence)
+        ) / sum(weights)
+        
+        return {
+            'corrected_text': leading + ''.join(
+                results['corrected_text'] + separator
+                for (_, results), separator in zip(per_sentence, separators)
+            ),
+            # Copies, since compiled results tag each improvement with its pass
+            'improvements': [dict(improvement) for _, results in per_sentence
+                             for improvement in results.get('improvements', [])],
+            'final_validation': {'quality_score': quality_score}
+        }
+    
     def _calculate_convergence_metrics(self, 
                                      input_text: str, 
                                      output_text: str, 
@@ -96,18 +178,27 @@ class MultiPassProcessor:
                                      curr_quality: float) -> Dict[str, float]:
         """Calculate convergence metrics for this pass"""
         
+        # Quality improvement
+        quality_improvement = curr_quality - prev_quality if prev_quality > 0 else curr_quality
+        
+        # No-op pass (common at convergence): similarity and change ratio are known
+        if input_text == output_text:
+            return {
+                "text_similarity": 1.0,
+                "quality_improvement": quality_improvement,
+                "change_ratio": 0.0,
+                "changes_made": False
+            }
+        
         # Text similarity (simple character-based)
         if len(input_text) > 0:
             text_similarity = 1 - (abs(len(output_text) - len(input_text)) / len(input_text))
         else:
             text_similarity = 1.0
         
-        # Quality improvement
-        quality_improvement = curr_quality - prev_quality if prev_quality > 0 else curr_quality
-        
         # Change ratio
-        changes_made = input_text != output_text
-        change_ratio = 0.0 if not changes_made else min(1.0, abs(len(output_text) - len(input_text)) / len(input_text))
+        changes_made = True
+        change_ratio = min(1.0, abs(len(output_text) - len(input_text)) / len(input_text)) if input_text else 1.0
         
         return {
             "text_similarity": text_similarity,
@@ -122,30 +213,32 @@ class MultiPassProcessor:
                                   pass_number: int) -> Tuple[bool, str]:
         """Determine if processing should continue"""
         
-        # Check maximum passes
-        if pass_number >= self.max_passes:
-            return False, f"Maximum passes ({self.max_passes}) reached"
-        
         # Check quality threshold
         if current_pass.quality_score >= self.min_quality_threshold:
-            return False, f"Quality threshold reached ({current_pass.quality_score:.1%})"
+            return False, f"{QUALITY_THRESHOLD_REASON} ({current_pass.quality_score:.1%})"
         
-        # Check convergence (minimal improvement)
-        if pass_number > 1:
-            improvement = current_pass.convergence_metrics.get("quality_improvement", 0)
-            if improvement < self.convergence_threshold:
-                return False, f"Convergence detected (improvement: {improvement:.1%})"
+        # Check convergence: no gain over the best score for `patience` passes,
+        # scaled down so short pass budgets can still detect it
+        patience = max(1, min(self.patience, self.max_passes - 1))
+        if self._passes_without_gain >= patience:
+            return False, f"{CONVERGENCE_REASON} (no quality gain in {self._passes_without_gain} passes)"
         
         # Check if no changes were made
         if not current_pass.convergence_metrics.get("changes_made", True):
             return False, "No changes made in this pass"
         
+        # Check maximum passes last, so the final pass still reports convergence
+        if pass_number >= self.max_passes:
+            return False, f"Maximum passes ({self.max_passes}) reached"
+        
         return True, "Continue processing"
     
     def _compile_multi_pass_results(self, 
                                    passes: List[RefinementPass], 
                                    total_time: float,
-                                   user_preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+                                   user_preferences: Dict[str, Any] = None,
+                                   converged: bool = False,
+                                   stop_reason: Optional[str] = None) -> Dict[str, Any]:
         """Compile final results from all passes"""
         
         if not passes:
@@ -169,7 +262,8 @@ class MultiPassProcessor:
             "final_quality": final_pass.quality_score,
             "quality_improvement": final_pass.quality_score - passes[0].quality_score,
             "total_improvements": len(all_improvements),
-            "convergence_achieved": final_pass.quality_score >= self.min_quality_threshold
+            "convergence_achieved": converged or final_pass.quality_score >= self.min_quality_threshold,
+            "stop_reason": stop_reason
         }
         
         # Create pass summary
@@ -248,6 +342,22 @@ class AdvancedProcessingOptions:
                 "description": "Maximum clarity, extensive improvements"
             }
         }
+        
+        # Build one MultiPassProcessor subclass per mode with its thresholds
+        # baked in as class constants
+        self.processor_classes = {
+            mode: type(
+                f"{mode.title()}Processor",
+                (MultiPassProcessor,),
+                {
+                    "max_passes": config["max_passes"],
+                    "convergence_threshold": config["convergence_threshold"],
+                    "min_quality_threshold": config["min_quality_threshold"],
+                    "__doc__": config["description"]
+                }
+            )
+            for mode, config in self.processing_modes.items()
+        }
     
     def get_processing_config(self, mode: str) -> Dict[str, Any]:
         """Get configuration for processing mode"""
@@ -257,10 +367,5 @@ class AdvancedProcessingOptions:
                               coordinator: AgentCoordinator, 
                               mode: str = "balanced") -> MultiPassProcessor:
         """Create processor with specific mode configuration"""
-        config = self.get_processing_config(mode)
-        
-        processor = MultiPassProcessor(coordinator, max_passes=config["max_passes"])
-        processor.convergence_threshold = config["convergence_threshold"]
-        processor.min_quality_threshold = config["min_quality_threshold"]
-        
-        return processor
\ No newline at end of file
+        processor_class = self.processor_classes.get(mode, self.processor_classes["balanced"])
+        return processor_class(coordinator)
\ No newline at end of file
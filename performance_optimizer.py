@@ -5,28 +5,124 @@ Performance optimization and caching system for Aclarador
 import time
 import hashlib
 import pickle
-import json
 import os
+import copy
+import json
 from typing import Dict, List, Any, Optional, Callable
-from functools import wraps
+from functools import wraps, lru_cache
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 import threading
+import weakref
+import logging
+from operator import mul
 from datetime import datetime, timedelta
 
-@dataclass
+log = logging.getLogger(__name__)
+
+# Maximum number of records kept by performance_monitor per function
+PERFORMANCE_LOG_SIZE = 10_000
+
+# Concurrent process_func calls per batch; bounds the load on the LLM endpoint
+BATCH_MAX_WORKERS = 4
+
+# Minimum cosine similarity for a semantic cache hit
+SEMANTIC_SIMILARITY_THRESHOLD = 0.85
+
+# Monotonic integer clock for TTL and duration math; wall-clock
+# time.time() is kept only for human-readable timestamps
+_now = time.perf_counter_ns
+NS_PER_SECOND = 1_000_000_000
+
+class _Snapshot:
+    """Private copy of a cached value, pickled once on put
+
+    Every restore() returns a fresh copy the caller is free to modify; an
+    unpickle costs a fraction of a deepcopy of the same agent result.
+    Unpicklable values fall back to deep copies.
+    """
+    __slots__ = ('_data', '_value')
+    
+    def __init__(self, value: Any):
+        try:
+            self._data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._value = None
+        except (pickle.PicklingError, AttributeError, TypeError):
+            self._data = None
+            self._value = copy.deepcopy(value)
+    
+    def restore(self) -> Any:
+        """Return a fresh copy of the value"""
+        if self._data is not None:
+            return pickle.loads(self._data)
+        return copy.deepcopy(self._value)
+
+@dataclass(slots=True)
 class CacheEntry:
     """Represents a cached result"""
     key: str
-    value: Any
-    timestamp: float
+    value: _Snapshot
+    timestamp: int  # perf_counter_ns
     access_count: int
-    last_access: float
-    expiry_time: Optional[float] = None
+    last_access: int  # perf_counter_ns
+    expiry_time: Optional[int] = None  # perf_counter_ns
+
+class _CacheReaper:
+    """One daemon thread that periodically sweeps expired entries out of every registered cache"""
+    
+    def __init__(self):
+        # cache -> (interval, next sweep), both perf_counter_ns; weak, so a
+        # registered cache can still be collected
+        self._caches = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def register(self, cache, interval: float) -> None:
+        """Sweep the cache every interval seconds"""
+        interval_ns = int(interval * NS_PER_SECOND)
+        with self._lock:
+            self._caches[cache] = (interval_ns, _now() + interval_ns)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="InMemoryCacheReaper", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+    
+    def unregister(self, cache) -> None:
+        """Stop sweeping the cache"""
+        with self._lock:
+            self._caches.pop(cache, None)
+    
+    def _run(self) -> None:
+        """Sweep the caches that are due, then sleep until the next one is"""
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                now = _now()
+                due = []
+                next_sweep = None
+                for cache, (interval_ns, sweep_at) in list(self._caches.items()):
+                    if sweep_at <= now:
+                        due.append(cache)
+                        sweep_at = now + interval_ns
+                        self._caches[cache] = (interval_ns, sweep_at)
+                    next_sweep = sweep_at if next_sweep is None else min(next_sweep, sweep_at)
+            
+            for cache in due:
+                cache.reap_expired()
+            # Drop the references before sleeping so idle caches can be collected
+            due = cache = None
+            
+            timeout = None if next_sweep is None else max(0, next_sweep - _now()) / NS_PER_SECOND
+            self._wakeup.wait(timeout)
+
+_REAPER = _CacheReaper()
 
 class InMemoryCache:
     """Thread-safe in-memory cache with LRU eviction"""
     
-    def __init__(self, max_size: int = 100, default_ttl: int = 3600):
+    def __init__(self, max_size: int = 100, default_ttl: int = 3600, reap_interval: Optional[float] = 60):
         self.max_size = max_size
         self.default_ttl = default_ttl  # seconds
         self.cache: Dict[str, CacheEntry] = {}
@@ -34,12 +130,68 @@ class InMemoryCache:
         self._lock = threading.RLock()
         self.hits = 0
         self.misses = 0
+        
+        # Insertion order follows put order, so with one TTL for every entry
+        # it is also expiry order and a sweep can stop at the first live entry
+        self._entry_ttl: Optional[int] = None
+        self._uniform_ttl = True
+        
+        # The shared background reaper drops expired entries in bulk so they
+        # don't linger until their next access
+        if reap_interval:
+            _REAPER.register(self, reap_interval)
+    
+    def reap_expired(self) -> int:
+        """Remove all expired entries, returning how many were dropped"""
+        with self._lock:
+            now = _now()
+            expired = []
+            for key, entry in self.cache.items():
+                if entry.expiry_time and now > entry.expiry_time:
+                    expired.append(key)
+                elif self._uniform_ttl:
+                    break
+            for key in expired:
+                del self.cache[key]
+            if expired:
+                expired_keys = set(expired)
+                self.access_order = [key for key in self.access_order if key not in expired_keys]
+            return len(expired)
+    
+    def stop_reaper(self) -> None:
+        """Stop sweeping this cache in the background"""
+        _REAPER.unregister(self)
     
     def _generate_key(self, *args, **kwargs) -> str:
         """Generate cache key from arguments"""
-        key_data = {'args': args, 'kwargs': sorted(kwargs.items())}
-        key_string = json.dumps(key_data, default=str, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
+        # Feed length-prefixed bytes straight into the hasher instead of
+        # serializing the whole argument tuple to JSON first
+        hasher = hashlib.md5()
+        for value in args:
+            self._update_key_hash(hasher, value)
+        # Every component starts with a type tag, so this marker keeps
+        # f("a", "b") and f(a="b") apart
+        hasher.update(b"k")
+        for name, value in sorted(kwargs.items()):
+            self._update_key_hash(hasher, name)
+            self._update_key_hash(hasher, value)
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def _update_key_hash(hasher, value: Any) -> None:
+        """Add a single type-tagged key component to the hash stream"""
+        if isinstance(value, str):
+            hasher.update(b"s")
+            data = value.encode()
+        else:
+            # The type name keeps f(1) apart from f("1") and f(None) from f("None")
+            type_name = type(value).__qualname__.encode()
+            hasher.update(b"r")
+            hasher.update(len(type_name).to_bytes(8, 'little'))
+            hasher.update(type_name)
+            data = repr(value).encode()
+        hasher.update(len(data).to_bytes(8, 'little'))
+        hasher.update(data)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
@@ -51,7 +203,7 @@ class InMemoryCache:
             entry = self.cache[key]
             
             # Check expiry
-            if entry.expiry_time and time.time() > entry.expiry_time:
+            if entry.expiry_time and _now() > entry.expiry_time:
                 del self.cache[key]
                 if key in self.access_order:
                     self.access_order.remove(key)
@@ -60,7 +212,7 @@ class InMemoryCache:
             
             # Update access info
             entry.access_count += 1
-            entry.last_access = time.time()
+            entry.last_access = _now()
             
             # Update LRU order
             if key in self.access_order:
@@ -68,13 +220,19 @@ class InMemoryCache:
             self.access_order.append(key)
             
             self.hits += 1
-            return entry.value
+            return entry.value.restore()
     
     def put(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Put value in cache"""
+        """Put value in cache (a private copy, so callers can't poison the cache)"""
+        value = _Snapshot(value)
         with self._lock:
-            now = time.time()
-            expiry = now + (ttl or self.default_ttl)
+            now = _now()
+            ttl = ttl or self.default_ttl
+            expiry = now + ttl * NS_PER_SECOND
+            if self._entry_ttl is None:
+                self._entry_ttl = ttl
+            elif ttl != self._entry_ttl:
+                self._uniform_ttl = False
             
             entry = CacheEntry(
                 key=key,
@@ -89,6 +247,8 @@ class InMemoryCache:
             if len(self.cache) >= self.max_size and key not in self.cache:
                 self._evict_lru()
             
+            # Re-insert at the end to keep the dict in put order
+            self.cache.pop(key, None)
             self.cache[key] = entry
             
             # Update access order
@@ -108,6 +268,8 @@ class InMemoryCache:
         with self._lock:
             self.cache.clear()
             self.access_order.clear()
+            self._entry_ttl = None
+            self._uniform_ttl = True
             self.hits = 0
             self.misses = 0
     
@@ -181,20 +343,162 @@ class PersistentCache:
         except OSError:
             pass
 
+class SemanticCache:
+    """Thread-safe cache that also answers for near-duplicate texts
+
+    Texts are embedded with a multilingual sentence-transformers model and a
+    lookup returns the value stored for the most similar text once cosine
+    similarity reaches the threshold. Without the model, lookups are disabled:
+    word overlap can't tell "El perro muerde" from "El perro no muerde".
+    """
+    
+    def __init__(self, max_size: int = 200, default_ttl: int = 1800,
+                 threshold: float = SEMANTIC_SIMILARITY_THRESHOLD,
+                 model_name: str = 'paraphrase-multilingual-MiniLM-L12-v2',
+                 encoder: Optional[Callable[[str], List[float]]] = None):
+        self.max_size = max_size
+        self.default_ttl = default_ttl  # seconds
+        self.threshold = threshold
+        self.model_name = model_name
+        # (namespace, text) -> (unit vector, value, expiry), least recently used first
+        self.entries: OrderedDict = OrderedDict()
+        # An injected encoder must return unit vectors of a fixed length
+        self._encoder: Optional[Callable[[str], List[float]]] = encoder
+        self._encoder_loaded = encoder is not None
+        self._encoder_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+    
+    def encode(self, text: str) -> Optional[List[float]]:
+        """Embed text as a unit vector, or None when no sentence encoder is available"""
+        if not self._encoder_loaded:
+            with self._encoder_lock:
+                if not self._encoder_loaded:
+                    self._encoder = self._load_encoder()
+                    self._encoder_loaded = True
+        return self._encoder(text) if self._encoder else None
+    
+    def _load_encoder(self) -> Optional[Callable[[str], List[float]]]:
+        """Load the sentence model, or None when it isn't available"""
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(self.model_name)
+        except (ImportError, OSError) as e:
+            log.info("Semantic cache disabled, no sentence encoder: %s", e)
+            return None
+        except Exception:
+            log.exception("Semantic cache disabled, sentence encoder %s failed to load", self.model_name)
+            return None
+        return lambda text: model.encode(text, normalize_embeddings=True).tolist()
+    
+    @staticmethod
+    def _cosine(vector: List[float], other: List[float]) -> float:
+        """Cosine similarity of two unit vectors"""
+        return sum(map(mul, vector, other))
+    
+    def get(self, namespace: str, vector: List[float], threshold: Optional[float] = None) -> Optional[Any]:
+        """Get the value stored for the most similar text in the namespace"""
+        with self._lock:
+            now = _now()
+            best_key, best_score = None, threshold or self.threshold
+            expired = []
+            
+            # Linear top-1 search; the cache is small and bounded by max_size
+            for key, (other, _, expiry) in self.entries.items():
+                if now > expiry:
+                    expired.append(key)
+                elif key[0] == namespace:
+                    score = self._cosine(vector, other)
+                    if score >= best_score:
+                        best_key, best_score = key, score
+            
+            for key in expired:
+                del self.entries[key]
+            
+            if best_key is None:
+                self.misses += 1
+                return None
+            
+            self.entries.move_to_end(best_key)
+            self.hits += 1
+            return self.entries[best_key][1].restore()
+    
+    def put(self, namespace: str, text: str, vector: List[float], value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value under the text's vector"""
+        value = _Snapshot(value)
+        with self._lock:
+            key = (namespace, text)
+            self.entries[key] = (vector, value, _now() + (ttl or self.default_ttl) * NS_PER_SECOND)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Clear all cache entries"""
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            total_requests = self.hits + self.misses
+            
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total_requests if total_requests > 0 else 0,
+                'threshold': self.threshold,
+                'total_requests': total_requests
+            }
+
+class _AgentContextKey:
+    """Hashable stand-in for an agent context, equal to any context with the same contents"""
+    
+    __slots__ = ('context', 'digest')
+    
+    def __init__(self, context: Optional[Dict[str, Any]]):
+        self.context = context
+        # Objects such as the knowledge base handle digest by their default
+        # repr, i.e. by identity
+        self.digest = hashlib.blake2b(
+            json.dumps(context, sort_keys=True, default=repr).encode(), digest_size=16
+        ).digest()
+    
+    def __hash__(self) -> int:
+        return hash(self.digest)
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _AgentContextKey) and self.digest == other.digest
+
 class PerformanceOptimizer:
     """Main performance optimization system"""
     
-    def __init__(self, cache_dir: str = "./cache"):
+    def __init__(self, cache_dir: str = "./cache",
+                 semantic_encoder: Optional[Callable[[str], List[float]]] = None):
         self.memory_cache = InMemoryCache(max_size=200, default_ttl=1800)  # 30 min
+        self.semantic_cache = SemanticCache(max_size=200, default_ttl=1800, encoder=semantic_encoder)
         self.persistent_cache = PersistentCache(cache_dir, max_file_age=86400)  # 24 hours
         self.performance_metrics = {
             'processing_times': [],
             'cache_performance': {},
             'optimization_applied': []
         }
+        self.agent_caches: Dict[str, Callable] = {}
     
-    def cached(self, ttl: Optional[int] = None, persistent: bool = False):
-        """Decorator for caching function results"""
+    def cached(self, ttl: Optional[int] = None, persistent: bool = False,
+               semantic: bool = False, threshold: Optional[float] = None):
+        """Decorator for caching function results
+
+        Every caller gets its own copy of a cached result, free to modify.
+        With semantic=True a call whose first argument is text similar enough
+        to an earlier one (cosine similarity >= threshold) reuses that call's
+        result.
+        """
         def decorator(func: Callable) -> Callable:
             @wraps(func)
             def wrapper(*args, **kwargs):
@@ -206,6 +510,16 @@ class PerformanceOptimizer:
                 if result is not None:
                     return result
                 
+                # Try the semantic cache; other arguments must still match exactly
+                vector = None
+                if semantic and args and isinstance(args[0], str):
+                    vector = self.semantic_cache.encode(args[0])
+                    if vector is not None:
+                        namespace = self.memory_cache._generate_key(func.__name__, *args[1:], **kwargs)
+                        result = self.semantic_cache.get(namespace, vector, threshold)
+                        if result is not None:
+                            return result
+                
                 # Try persistent cache if enabled
                 if persistent:
                     result = self.persistent_cache.get(cache_key)
@@ -215,14 +529,16 @@ class PerformanceOptimizer:
                         return result
                 
                 # Execute function and cache result
-                start_time = time.time()
+                start_ns = _now()
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
+                execution_time = (_now() - start_ns) / NS_PER_SECOND
                 
                 # Cache the result
-                self.memory_cache.put(cache_key, result, ttl)
                 if persistent:
                     self.persistent_cache.put(cache_key, result)
+                self.memory_cache.put(cache_key, result, ttl)
+                if vector is not None:
+                    self.semantic_cache.put(namespace, args[0], vector, result, ttl)
                 
                 # Record performance metrics
                 self.performance_metrics['processing_times'].append({
@@ -234,26 +550,55 @@ class PerformanceOptimizer:
                 
                 return result
             
+            def store_result(result, *args, **kwargs) -> None:
+                """Cache a result computed elsewhere (e.g. in a worker process) for these arguments"""
+                cache_key = self.memory_cache._generate_key(func.__name__, *args, **kwargs)
+                if persistent:
+                    self.persistent_cache.put(cache_key, result)
+                self.memory_cache.put(cache_key, result, ttl)
+            
+            # Lets preload_cache fill this wrapper's caches with the same key and settings
+            wrapper.cache_owner = self
+            wrapper.store_result = store_result
             return wrapper
         return decorator
     
-    def batch_process_texts(self, texts: List[str], process_func: Callable) -> List[Any]:
-        """Optimize batch processing of multiple texts"""
-        results = []
-        
+    def batch_process_texts(self, texts: List[str], process_func: Callable,
+                            max_workers: int = BATCH_MAX_WORKERS,
+                            executor: Optional[Executor] = None) -> List[Any]:
+        """Optimize batch processing of multiple texts
+
+        Calls for different texts are independent (mostly waiting on agents),
+        so they overlap on a thread pool; results keep the grouped order. Pass a
+        long-lived executor to reuse its threads, otherwise a pool of up to
+        max_workers threads is created for this batch.
+        """
         # Group similar texts to benefit from caching
-        text_groups = self._group_similar_texts(texts)
+        text_groups = [group for group in self._group_similar_texts(texts) if group]
+        if not text_groups:
+            return []
         
-        for group in text_groups:
-            # Process first text in group normally
-            if group:
-                first_result = process_func(group[0])
-                results.append(first_result)
-                
-                # For similar texts, use optimized processing
-                for text in group[1:]:
-                    optimized_result = self._process_similar_text(text, group[0], first_result, process_func)
-                    results.append(optimized_result)
+        if executor is not None:
+            return self._run_batch(text_groups, process_func, executor)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(texts)))) as executor:
+            return self._run_batch(text_groups, process_func, executor)
+    
+    def _run_batch(self, text_groups: List[List[str]], process_func: Callable, executor: Executor) -> List[Any]:
+        """Process grouped texts on the executor"""
+        # Process the first text of every group normally, all at once
+        first_results = list(executor.map(process_func, [group[0] for group in text_groups]))
+        
+        # For similar texts, use optimized processing, again concurrently
+        similar_futures = [
+            [executor.submit(self._process_similar_text, text, group[0], first_result, process_func)
+             for text in group[1:]]
+            for group, first_result in zip(text_groups, first_results)
+        ]
+        
+        results = []
+        for first_result, futures in zip(first_results, similar_futures):
+            results.append(first_result)
+            results.extend(future.result() for future in futures)
         
         return results
     
@@ -324,7 +669,7 @@ class PerformanceOptimizer:
         # In practice, you'd make intelligent adjustments based on the differences
         
         if isinstance(reference_result, dict):
-            adjusted_result = reference_result.copy()
+            adjusted_result = dict(reference_result)
             # Adjust text-specific fields
             if 'original_text' in adjusted_result:
                 adjusted_result['original_text'] = text
@@ -337,17 +682,55 @@ class PerformanceOptimizer:
         
         return reference_result
     
-    def preload_cache(self, common_texts: List[str], process_func: Callable) -> None:
-        """Preload cache with common text patterns"""
+    def preload_cache(self, common_texts: List[str], process_func: Callable, parallel: bool = False) -> None:
+        """Preload cache with common text patterns
+
+        process_func should be a function wrapped by this optimizer's cached().
+        With parallel=True the texts are processed in worker processes and the
+        results are stored through the wrapper, with its own key and
+        persistence settings; texts whose worker fails are processed here.
+        """
         print("Preloading cache with common patterns...")
         
-        for i, text in enumerate(common_texts):
-            print(f"Processing pattern {i+1}/{len(common_texts)}")
-            # This will cache the results
+        pending = list(common_texts)
+        store_result = getattr(process_func, 'store_result', None)
+        owned = getattr(process_func, 'cache_owner', None) is self
+        if parallel and owned and len(pending) > 1 and self._is_picklable(process_func):
+            # Worker processes can't share the in-memory LRU, so results come
+            # back to the parent and are cached here
+            pending = []
+            max_workers = min(os.cpu_count() or 1, len(common_texts))
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(process_func, text) for text in common_texts]
+                    for i, (text, future) in enumerate(zip(common_texts, futures)):
+                        print(f"Processing pattern {i+1}/{len(common_texts)}")
+                        try:
+                            store_result(future.result(), text)
+                        except Exception as e:
+                            print(f"Worker failed for pattern {i+1}, retrying in process: {e}")
+                            pending.append(text)
+            except Exception as e:
+                # The pool itself failed; texts already stored are cache hits below
+                print(f"Parallel preloading unavailable: {e}")
+                pending = list(common_texts)
+        
+        for i, text in enumerate(pending):
+            print(f"Processing pattern {i+1}/{len(pending)}")
+            # A cached() wrapper stores the result itself
             process_func(text)
         
         print("Cache preloading completed")
     
+    @staticmethod
+    def _is_picklable(obj: Any) -> bool:
+        """Check whether an object can be sent to a worker process"""
+        try:
+            pickle.dumps(obj)
+            return True
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+    
     def optimize_agent_coordination(self, coordinator, enable_parallel: bool = True) -> None:
         """Optimize agent coordination for better performance"""
         
@@ -356,13 +739,36 @@ class PerformanceOptimizer:
             coordinator._performance_optimized = True
             
             # Add caching to agent methods
-            coordinator.grammar.analyze = self.cached(ttl=1800)(coordinator.grammar.analyze)
-            coordinator.style.analyze = self.cached(ttl=1800)(coordinator.style.analyze)
-            coordinator.seo.analyze = self.cached(ttl=1800)(coordinator.seo.analyze)
-            coordinator.validator.analyze = self.cached(ttl=900)(coordinator.validator.analyze)
+            for agent_name in ('grammar', 'style', 'seo', 'validator'):
+                agent = getattr(coordinator, agent_name)
+                agent.analyze = self._lru_cached_analyze(agent_name, agent.analyze)
             
             print("Agent coordination optimized with caching")
     
+    def _lru_cached_analyze(self, agent_name: str, analyze: Callable, maxsize: int = 256) -> Callable:
+        """Wrap an agent's analyze method with a C-level LRU cache"""
+        
+        # Agent output depends only on the text and the whole context, so the
+        # key is the text plus a digest of the context's contents; TTL is
+        # unnecessary for deterministic analysis
+        @lru_cache(maxsize=maxsize)
+        def cached_analyze(text: str, context_key: _AgentContextKey) -> _Snapshot:
+            # The cache keeps only the digest, not the caller's context
+            context, context_key.context = context_key.context, None
+            return _Snapshot(analyze(text, context=context))
+        
+        @wraps(analyze)
+        def wrapper(text: str, context: Dict[str, Any] = None) -> Any:
+            try:
+                context_key = _AgentContextKey(context)
+            except (TypeError, ValueError):
+                return analyze(text, context=context)  # Contents can't be digested
+            # Copy, so callers annotating the result don't change the cached one
+            return cached_analyze(text, context_key).restore()
+        
+        self.agent_caches[agent_name] = cached_analyze
+        return wrapper
+    
     def get_performance_report(self) -> Dict[str, Any]:
         """Get comprehensive performance report"""
         
@@ -388,14 +794,19 @@ class PerformanceOptimizer:
         
         return {
             'cache_stats': self.memory_cache.get_stats(),
+            'semantic_cache_stats': self.semantic_cache.get_stats(),
+            'agent_cache_stats': {
+                name: cache.cache_info()._asdict() for name, cache in self.agent_caches.items()
+            },
             'processing_stats': time_stats,
             'optimizations_applied': len(self.performance_metrics['optimization_applied']),
             'timestamp': time.time()
         }
     
     def clear_all_caches(self) -> None:
-        """Clear both memory and persistent caches"""
+        """Clear memory, semantic and persistent caches"""
         self.memory_cache.clear()
+        self.semantic_cache.clear()
         self.persistent_cache.clear()
         print("All caches cleared")
     
@@ -428,6 +839,7 @@ def performance_monitor(func: Callable) -> Callable:
     @wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.time()
+        start_ns = _now()
         try:
             result = func(*args, **kwargs)
             success = True
@@ -438,8 +850,7 @@ def performance_monitor(func: Callable) -> Callable:
             error = str(e)
             raise
         finally:
-            end_time = time.time()
-            execution_time = end_time - start_time
+            execution_time = (_now() - start_ns) / NS_PER_SECOND
             
             # Log performance data (in production, you'd send this to monitoring system)
             performance_data = {
@@ -453,13 +864,29 @@ def performance_monitor(func: Callable) -> Callable:
             }
             
             # In production, send to monitoring system
-            # For now, just store in memory
-            if not hasattr(wrapper, 'performance_log'):
-                wrapper.performance_log = []
-            wrapper.performance_log.append(performance_data)
+            # For now, keep a bounded log plus rolling aggregates in memory
+            with wrapper._stats_lock:
+                wrapper.performance_log.append(performance_data)
+                stats = wrapper._stats
+                stats['count'] += 1
+                stats['total_time'] += execution_time
+                stats['min_time'] = min(stats['min_time'], execution_time)
+                stats['max_time'] = max(stats['max_time'], execution_time)
+                if not success:
+                    stats['errors'] += 1
         
         return result
     
+    wrapper.performance_log = deque(maxlen=PERFORMANCE_LOG_SIZE)
+    # Concurrent calls would lose read-modify-write updates to the aggregates
+    wrapper._stats_lock = threading.Lock()
+    wrapper._stats = {
+        'count': 0,
+        'errors': 0,
+        'total_time': 0.0,
+        'min_time': float('inf'),
+        'max_time': 0.0
+    }
     return wrapper
 
 class OptimizedAgentCoordinator:
@@ -475,11 +902,15 @@ class OptimizedAgentCoordinator:
         """Process text with performance optimizations"""
         return self.base_coordinator.process_text(text, selected_agents)
     
-    def process_multiple_texts(self, texts: List[str], selected_agents: List[str] = None) -> List[Dict[str, Any]]:
-        """Process multiple texts with batch optimizations"""
+    def process_multiple_texts(self, texts: List[str], selected_agents: List[str] = None,
+                               max_workers: int = BATCH_MAX_WORKERS,
+                               executor: Optional[Executor] = None) -> List[Dict[str, Any]]:
+        """Process multiple texts with batch optimizations, on a shared executor if given"""
         return self.optimizer.batch_process_texts(
             texts,
-            lambda text: self.base_coordinator.process_text(text, selected_agents)
+            lambda text: self.base_coordinator.process_text(text, selected_agents),
+            max_workers,
+            executor
         )
     
     def get_performance_stats(self) -> Dict[str, Any]:
@@ -4,42 +4,75 @@ Advanced quality analysis and convergence detection system
 
 import re
 import math
-from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass
-from collections import Counter
-import statistics
+import hashlib
+from typing import Dict, List, Any, Tuple, Optional, Deque
+from dataclasses import dataclass, asdict
+from collections import Counter, OrderedDict, deque
+from bisect import bisect_left, bisect_right
 
-@dataclass
-class QualityMetrics:
-    """Comprehensive quality metrics for text analysis"""
+# Patterns shared by every analysis, compiled once at import
+# A sentence runs between terminators, from its first to its last non-space character
+SENTENCE_BODY_RE = re.compile(r'[^.!?\s](?:[^.!?]*[^.!?\s])?')
+TENSE_RE = re.compile(
+    r'\b(?P<present>es|está|tiene|hace)\b'
+    r'|\b(?P<past>fue|estuvo|tuvo|hizo)\b'
+    r'|\b(?P<future>será|estará|tendrá|hará)\b'
+)
+
+# Discourse markers that signal logical flow between sentences, as whole words
+FLOW_INDICATORS_RE = re.compile(r'\b(?:primero|segundo|además|por tanto|finalmente|en conclusión)\b')
+
+# Syllable approximation: each run of vowels is one syllable, and a word
+# without vowels still counts as one
+SPANISH_VOWELS = 'aeiouáéíóúü'
+VOWEL_GROUP_RE = re.compile(f'[{SPANISH_VOWELS}]+')
+VOWELLESS_WORD_RE = re.compile(rf'(?<!\S)[^\s{SPANISH_VOWELS}]+(?!\S)')
+
+# Sentence length buckets for complexity: (<=4, 5-20, 21-30, >30 words)
+SENTENCE_LENGTH_BOUNDS = (4, 20, 30)
+SENTENCE_LENGTH_FACTORS = (0.8, 1.0, 0.7, 0.5)
+
+# Convergence and trend checks only look at the latest few passes
+CONVERGENCE_WINDOW = 3
+
+def flesch_readability(avg_sentence_length: float, avg_syllables_per_word: float) -> float:
+    """Spanish Flesch Reading Ease (adapted formula), scaled to 0-1"""
+    flesch_score = 206.84 - (1.02 * avg_sentence_length) - (0.60 * avg_syllables_per_word)
+    return max(0.0, min(100.0, flesch_score)) / 100
+
+@dataclass(slots=True, frozen=True)
+class CoreQualityMetrics:
+    """Quality metrics that drive overall quality and convergence decisions"""
     
-    # Readability metrics
+    # Weighted components of overall quality
     readability_score: float
-    sentence_complexity: float
-    vocabulary_complexity: float
     structure_score: float
-    
-    # Language clarity metrics
     clarity_score: float
     coherence_score: float
-    precision_score: float
-    
-    # Technical metrics
     grammar_accuracy: float
-    style_consistency: float
-    seo_optimization: float
     
     # Overall metrics
     overall_quality: float
     confidence_level: float
     improvement_potential: float
 
+@dataclass(slots=True, frozen=True)
+class QualityMetrics(CoreQualityMetrics):
+    """Comprehensive quality metrics for text analysis"""
+    
+    # Detail metrics
+    sentence_complexity: float
+    vocabulary_complexity: float
+    precision_score: float
+    style_consistency: float
+    seo_optimization: float
+
 class QualityAnalyzer:
     """Advanced quality analyzer with convergence detection"""
     
     def __init__(self):
         # Spanish language specific parameters
-        self.spanish_complexity_indicators = {
+        complexity_patterns = {
             'complex_structures': [
                 r'\b(no obstante|sin embargo|por consiguiente|a pesar de que|dado que)\b',
                 r'\b(cuyo|cuya|cuyos|cuyas)\b',
@@ -55,6 +88,33 @@ class QualityAnalyzer:
             ]
         }
         
+        # Compile every indicator pattern once; analysis runs them per sentence/word
+        self.spanish_complexity_indicators = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in complexity_patterns.items()
+        }
+        
+        # Fused alternations: one regex call per word/sentence instead of one per pattern.
+        # Structure patterns keep a named group each so distinct matches can still be counted.
+        self.complex_vocabulary_re = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in complexity_patterns['complex_vocabulary']),
+            re.IGNORECASE
+        )
+        self.complex_structures_re = re.compile(
+            '|'.join(f'(?P<structure_{i}>{pattern})'
+                     for i, pattern in enumerate(complexity_patterns['complex_structures'])),
+            re.IGNORECASE
+        )
+        
+        # Precision indicators: redundant phrases fused into one regex, fillers as a set
+        redundant_phrases = [
+            'muy muy', 'que que', 'el el', 'la la', 'de de',
+            'completamente total', 'absolutamente completo',
+            'totalmente absoluto'
+        ]
+        self.redundant_phrases_re = re.compile('|'.join(map(re.escape, redundant_phrases)))
+        self.filler_words = frozenset(['realmente', 'básicamente', 'obviamente', 'claramente', 'simplemente'])
+        
         # Quality thresholds for convergence detection
         self.convergence_thresholds = {
             'minimal_improvement': 0.02,  # 2% improvement threshold
@@ -63,29 +123,87 @@ class QualityAnalyzer:
             'stability_threshold': 0.01  # 1% stability threshold
         }
     
+    def analyze_core_quality(self, text: str, context: Dict[str, Any] = None) -> CoreQualityMetrics:
+        """Analyze only the metrics that feed overall quality and convergence decisions"""
+        
+        prepared = self._prepare_text(text)
+        if prepared is None:
+            return CoreQualityMetrics(0, 0, 0, 0, 0, 0, 0, 0)
+        
+        return CoreQualityMetrics(**self._core_quality_values(text, prepared, self._context_signature(context)))
+    
+    def analyze_core_quality_batch(self, texts: List[str],
+                                   contexts: List[Optional[Dict[str, Any]]]) -> List[CoreQualityMetrics]:
+        """Analyze core quality for several texts, splitting all of them into sentences in one scan"""
+        
+        metrics = []
+        for text, context, sentence_spans in zip(texts, contexts, self._extract_sentence_spans_batch(texts)):
+            prepared = self._prepare_text(text, sentence_spans)
+            if prepared is None:
+                metrics.append(CoreQualityMetrics(0, 0, 0, 0, 0, 0, 0, 0))
+            else:
+                metrics.append(CoreQualityMetrics(
+                    **self._core_quality_values(text, prepared, self._context_signature(context))
+                ))
+        return metrics
+    
     def analyze_comprehensive_quality(self, text: str, context: Dict[str, Any] = None) -> QualityMetrics:
         """Perform comprehensive quality analysis"""
         
-        # Basic text analysis
-        sentences = self._extract_sentences(text)
+        prepared = self._prepare_text(text)
+        if prepared is None:
+            return QualityMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        
+        signature = self._context_signature(context)
+        core_values = self._core_quality_values(text, prepared, signature)
+        sentence_spans, text_lower, sentences, words, sentence_lengths, avg_sentence_length = prepared
+        
+        # Scan the whole text once for complex structures and attribute hits to sentences
+        structure_groups = self._match_groups_per_sentence(self.complex_structures_re, text, sentence_spans)
+        structure_counts = [len(groups) for groups in structure_groups]
+        tense_groups = self._match_groups_per_sentence(TENSE_RE, text, sentence_spans)
+        
+        # Detail metrics, not needed for overall quality or convergence
+        return QualityMetrics(
+            **core_values,
+            sentence_complexity=self._analyze_sentence_complexity(sentence_lengths, structure_counts),
+            vocabulary_complexity=self._analyze_vocabulary_complexity(words),
+            precision_score=self._calculate_precision_score(text_lower, words),
+            style_consistency=self._analyze_style_consistency(sentence_lengths, avg_sentence_length, tense_groups),
+            seo_optimization=self._analyze_seo_quality(len(words), signature[3])
+        )
+    
+    def _prepare_text(self, text: str, sentence_spans: List[Tuple[int, int]] = None) -> Optional[Tuple]:
+        """Split text into the pieces every metric shares, or None if there is nothing to analyze"""
+        
+        if sentence_spans is None:
+            sentence_spans = self._extract_sentence_spans(text)
         words = text.split()
+        if not sentence_spans or not words:
+            return None
         
-        if not sentences or not words:
-            return QualityMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        sentences = [text[start:end] for start, end in sentence_spans]
         
-        # Calculate individual metrics
-        readability = self._calculate_readability(text, sentences, words)
-        sentence_complexity = self._analyze_sentence_complexity(sentences)
-        vocabulary_complexity = self._analyze_vocabulary_complexity(words)
-        structure_score = self._analyze_text_structure(text, sentences)
+        # Word count per sentence and its mean, shared by every sentence-level metric
+        sentence_lengths = [len(s.split()) for s in sentences]
+        avg_sentence_length = sum(sentence_lengths) / len(sentence_lengths)
         
-        clarity_score = self._calculate_clarity_score(text, sentences)
-        coherence_score = self._calculate_coherence_score(sentences)
-        precision_score = self._calculate_precision_score(text, words)
+        return sentence_spans, text.lower(), sentences, words, sentence_lengths, avg_sentence_length
+    
+    def _core_quality_values(self, text: str, prepared: Tuple, signature: Tuple) -> Dict[str, float]:
+        """Compute the core metrics, keyed by their CoreQualityMetrics field names"""
         
-        grammar_accuracy = self._estimate_grammar_accuracy(text, context)
-        style_consistency = self._analyze_style_consistency(sentences)
-        seo_optimization = self._analyze_seo_quality(text, context)
+        _, text_lower, sentences, words, sentence_lengths, avg_sentence_length = prepared
+        
+        # Context scalars extracted once; agent_count is None without agent results
+        improvements_count, agent_count, correction_count, _ = signature
+        word_count = len(words)
+        
+        readability = self._calculate_readability(text_lower, sentences, words)
+        structure_score = self._analyze_text_structure(text, sentence_lengths)
+        clarity_score = self._calculate_clarity_score(text, text_lower, sentences, avg_sentence_length)
+        coherence_score = self._calculate_coherence_score(sentences)
+        grammar_accuracy = self._estimate_grammar_accuracy(word_count, agent_count, correction_count)
         
         # Calculate overall quality with weights
         overall_quality = self._calculate_overall_quality({
@@ -96,28 +214,42 @@ class QualityAnalyzer:
             'coherence': coherence_score
         })
         
-        # Calculate confidence and improvement potential
-        confidence_level = self._calculate_confidence_level(text, context)
-        improvement_potential = self._calculate_improvement_potential(overall_quality, context)
+        return {
+            'readability_score': readability,
+            'structure_score': structure_score,
+            'clarity_score': clarity_score,
+            'coherence_score': coherence_score,
+            'grammar_accuracy': grammar_accuracy,
+            'overall_quality': overall_quality,
+            'confidence_level': self._calculate_confidence_level(word_count, agent_count),
+            'improvement_potential': self._calculate_improvement_potential(overall_quality, improvements_count)
+        }
+    
+    def _context_signature(self, context: Optional[Dict[str, Any]]) -> Tuple[int, Optional[int], int, Optional[float]]:
+        """Context fields that influence the quality metrics, as a hashable tuple:
+        (improvements, agents or None, grammar corrections, SEO balance or None)"""
+        
+        if not context:
+            return (0, None, 0, None)
         
-        return QualityMetrics(
-            readability_score=readability,
-            sentence_complexity=sentence_complexity,
-            vocabulary_complexity=vocabulary_complexity,
-            structure_score=structure_score,
-            clarity_score=clarity_score,
-            coherence_score=coherence_score,
-            precision_score=precision_score,
-            grammar_accuracy=grammar_accuracy,
-            style_consistency=style_consistency,
-            seo_optimization=seo_optimization,
-            overall_quality=overall_quality,
-            confidence_level=confidence_level,
-            improvement_potential=improvement_potential
+        improvements_count = len(context['improvements']) if 'improvements' in context else 0
+        if 'agent_results' not in context:
+            return (improvements_count, None, 0, None)
+        
+        agent_results = context['agent_results']
+        seo_results = agent_results.get('seo', {})
+        seo_balance = (
+            seo_results.get('clarity_balance', {}).get('balance_score', 0.7) if seo_results else None
+        )
+        return (
+            improvements_count,
+            len(agent_results),
+            len(agent_results.get('grammar', {}).get('corrections', [])),
+            seo_balance
         )
     
     def detect_convergence(self, 
-                          quality_history: List[QualityMetrics], 
+                          quality_history: List[CoreQualityMetrics], 
                           improvement_history: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Detect if quality improvements have converged"""
         
@@ -160,12 +292,42 @@ class QualityAnalyzer:
             'analysis_details': convergence_analysis
         }
     
-    def _extract_sentences(self, text: str) -> List[str]:
-        """Extract sentences from text"""
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip()]
-    
-    def _calculate_readability(self, text: str, sentences: List[str], words: List[str]) -> float:
+    def _extract_sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Extract (start, end) offsets of the stripped sentences in text"""
+        return [match.span() for match in SENTENCE_BODY_RE.finditer(text)]
+    
+    def _extract_sentence_spans_batch(self, texts: List[str]) -> List[List[Tuple[int, int]]]:
+        """Extract sentence spans of several texts with one scan over their concatenation"""
+        spans_by_text = [[] for _ in texts]
+        if not texts:
+            return spans_by_text
+        
+        # A terminator between texts keeps every sentence inside its own text
+        index, offset, boundary = 0, 0, len(texts[0])
+        for match in SENTENCE_BODY_RE.finditer('.'.join(texts)):
+            start, end = match.span()
+            while start > boundary:
+                index += 1
+                offset = boundary + 1
+                boundary = offset + len(texts[index])
+            spans_by_text[index].append((start - offset, end - offset))
+        
+        return spans_by_text
+    
+    def _match_groups_per_sentence(self, pattern: re.Pattern, text: str,
+                                   sentence_spans: List[Tuple[int, int]]) -> List[set]:
+        """Scan the whole text once and collect the named groups matched in each sentence"""
+        matched = [set() for _ in sentence_spans]
+        starts = [start for start, _ in sentence_spans]
+        
+        for match in pattern.finditer(text):
+            index = bisect_right(starts, match.start()) - 1
+            if index >= 0 and match.end() <= sentence_spans[index][1]:
+                matched[index].add(match.lastgroup)
+        
+        return matched
+    
+    def _calculate_readability(self, text_lower: str, sentences: List[str], words: List[str]) -> float:
         """Calculate readability score for Spanish text"""
         
         if not sentences or not words:
@@ -174,67 +336,34 @@ class QualityAnalyzer:
         # Basic metrics
         avg_sentence_length = len(words) / len(sentences)
         
-        # Count syllables (simplified for Spanish)
-        syllable_count = 0
-        for word in words:
-            syllable_count += self._count_spanish_syllables(word)
-        
-        avg_syllables_per_word = syllable_count / len(words) if words else 0
+        # Count syllables (simplified for Spanish) over the whole text at once
+        syllable_count = self._count_text_syllables(text_lower)
         
-        # Spanish Flesch Reading Ease (adapted formula)
-        if sentences and words:
-            flesch_score = 206.84 - (1.02 * avg_sentence_length) - (0.60 * avg_syllables_per_word)
-            readability = max(0, min(100, flesch_score)) / 100
-        else:
-            readability = 0
-        
-        return readability
-    
-    def _count_spanish_syllables(self, word: str) -> int:
-        """Count syllables in Spanish word (simplified)"""
-        word = word.lower()
-        vowels = 'aeiouáéíóúü'
-        syllables = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            if char in vowels:
-                if not prev_was_vowel:
-                    syllables += 1
-                prev_was_vowel = True
-            else:
-                prev_was_vowel = False
+        avg_syllables_per_word = syllable_count / len(words)
         
-        return max(1, syllables)
+        return flesch_readability(avg_sentence_length, avg_syllables_per_word)
+    
+    def _count_text_syllables(self, text_lower: str) -> int:
+        """Count syllables across all whitespace-separated words of a lowercased text"""
+        # findall counts inside the regex engine instead of a Python-level loop
+        vowel_groups = len(VOWEL_GROUP_RE.findall(text_lower))
+        vowelless_words = len(VOWELLESS_WORD_RE.findall(text_lower))
+        return vowel_groups + vowelless_words
     
-    def _analyze_sentence_complexity(self, sentences: List[str]) -> float:
+    def _analyze_sentence_complexity(self, sentence_lengths: List[int], structure_counts: List[int]) -> float:
         """Analyze sentence complexity"""
         
-        if not sentences:
+        if not sentence_lengths:
             return 1.0
         
-        complexity_scores = []
-        
-        for sentence in sentences:
-            words = sentence.split()
-            complexity = 1.0
-            
-            # Length-based complexity
-            if len(words) > 30:
-                complexity *= 0.5  # Very complex
-            elif len(words) > 20:
-                complexity *= 0.7  # Moderately complex
-            elif len(words) < 5:
-                complexity *= 0.8  # Too short might be unclear
-            
-            # Structure-based complexity
-            for pattern in self.spanish_complexity_indicators['complex_structures']:
-                if re.search(pattern, sentence, re.IGNORECASE):
-                    complexity *= 0.8
-            
-            complexity_scores.append(complexity)
+        # Length factor by table lookup: <5 words too short, 21-30 moderately
+        # complex, >30 very complex. Each distinct structure pattern costs 0.8.
+        complexity_scores = [
+            SENTENCE_LENGTH_FACTORS[bisect_left(SENTENCE_LENGTH_BOUNDS, length)] * 0.8 ** structure_count
+            for length, structure_count in zip(sentence_lengths, structure_counts)
+        ]
         
-        return statistics.mean(complexity_scores)
+        return sum(complexity_scores) / len(complexity_scores)
     
     def _analyze_vocabulary_complexity(self, words: List[str]) -> float:
         """Analyze vocabulary complexity"""
@@ -242,43 +371,37 @@ class QualityAnalyzer:
         if not words:
             return 1.0
         
-        complex_word_count = 0
-        
-        for word in words:
-            for pattern in self.spanish_complexity_indicators['complex_vocabulary']:
-                if re.search(pattern, word, re.IGNORECASE):
-                    complex_word_count += 1
-                    break
+        complex_word_count = sum(map(bool, map(self.complex_vocabulary_re.search, words)))
         
         complexity_ratio = complex_word_count / len(words)
         
         # Convert to score (lower complexity ratio = higher score)
         return max(0.2, 1.0 - (complexity_ratio * 2))
     
-    def _analyze_text_structure(self, text: str, sentences: List[str]) -> float:
+    def _analyze_text_structure(self, text: str, sentence_lengths: List[int]) -> float:
         """Analyze text structure quality"""
         
         structure_score = 1.0
         
         # Paragraph structure
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        if len(paragraphs) > 1:
-            avg_para_length = len(sentences) / len(paragraphs)
+        paragraph_count = sum(1 for p in text.split('\n\n') if p and not p.isspace())
+        if paragraph_count > 1:
+            avg_para_length = len(sentence_lengths) / paragraph_count
             if 2 <= avg_para_length <= 8:  # Optimal paragraph length
                 structure_score *= 1.0
             else:
                 structure_score *= 0.8
         
         # Sentence variety
-        sentence_lengths = [len(s.split()) for s in sentences]
-        if len(set(sentence_lengths)) > len(sentence_lengths) * 0.3:  # Good variety
+        unique_length_count = len(set(sentence_lengths))
+        if unique_length_count > len(sentence_lengths) * 0.3:  # Good variety
             structure_score *= 1.0
         else:
             structure_score *= 0.9
         
         return min(1.0, structure_score)
     
-    def _calculate_clarity_score(self, text: str, sentences: List[str]) -> float:
+    def _calculate_clarity_score(self, text: str, text_lower: str, sentences: List[str], avg_length: float) -> float:
         """Calculate text clarity score"""
         
         clarity_factors = []
@@ -286,26 +409,23 @@ class QualityAnalyzer:
         # Active vs passive voice
         passive_count = 0
         for pattern in self.spanish_complexity_indicators['passive_voice']:
-            passive_count += len(re.findall(pattern, text, re.IGNORECASE))
+            passive_count += len(pattern.findall(text))
         
         passive_ratio = passive_count / len(sentences) if sentences else 0
         active_voice_score = max(0.5, 1.0 - passive_ratio)
         clarity_factors.append(active_voice_score)
         
         # Sentence length consistency
-        lengths = [len(s.split()) for s in sentences]
-        if lengths:
-            avg_length = statistics.mean(lengths)
+        if sentences:
             length_score = 1.0 if 10 <= avg_length <= 25 else 0.7
             clarity_factors.append(length_score)
         
         # Logical flow indicators
-        flow_indicators = ['primero', 'segundo', 'además', 'por tanto', 'finalmente', 'en conclusión']
-        flow_count = sum(1 for indicator in flow_indicators if indicator in text.lower())
+        flow_count = len({match.group() for match in FLOW_INDICATORS_RE.finditer(text_lower)})
         flow_score = min(1.0, flow_count / max(1, len(sentences) / 5))
         clarity_factors.append(flow_score)
         
-        return statistics.mean(clarity_factors) if clarity_factors else 0.5
+        return sum(clarity_factors) / len(clarity_factors) if clarity_factors else 0.5
     
     def _calculate_coherence_score(self, sentences: List[str]) -> float:
         """Calculate text coherence score"""
@@ -316,37 +436,23 @@ class QualityAnalyzer:
         coherence_score = 0.8  # Base score
         
         # Word repetition analysis (semantic coherence indicator)
-        all_words = []
-        for sentence in sentences:
-            words = [w.lower() for w in sentence.split() if len(w) > 3]
-            all_words.extend(words)
+        word_freq = Counter(w.lower() for sentence in sentences for w in sentence.split() if len(w) > 3)
         
-        if all_words:
-            word_freq = Counter(all_words)
+        if word_freq:
             repeated_words = sum(1 for count in word_freq.values() if count > 1)
-            repetition_score = min(1.0, repeated_words / len(set(all_words)))
+            repetition_score = min(1.0, repeated_words / len(word_freq))
             coherence_score += repetition_score * 0.2
         
         return min(1.0, coherence_score)
     
-    def _calculate_precision_score(self, text: str, words: List[str]) -> float:
+    def _calculate_precision_score(self, text_lower: str, words: List[str]) -> float:
         """Calculate precision/conciseness score"""
         
-        # Redundancy detection
-        redundant_phrases = [
-            'muy muy', 'que que', 'el el', 'la la', 'de de',
-            'completamente total', 'absolutamente completo',
-            'totalmente absoluto'
-        ]
-        
-        redundancy_count = 0
-        text_lower = text.lower()
-        for phrase in redundant_phrases:
-            redundancy_count += text_lower.count(phrase)
+        # Redundancy detection (all phrases in one pass)
+        redundancy_count = len(self.redundant_phrases_re.findall(text_lower))
         
         # Filler words
-        filler_words = ['realmente', 'básicamente', 'obviamente', 'claramente', 'simplemente']
-        filler_count = sum(1 for word in words if word.lower() in filler_words)
+        filler_count = sum(map(self.filler_words.__contains__, map(str.lower, words)))
         
         # Calculate precision
         total_issues = redundancy_count + filler_count
@@ -354,19 +460,17 @@ class QualityAnalyzer:
         
         return precision_score
     
-    def _estimate_grammar_accuracy(self, text: str, context: Dict[str, Any] = None) -> float:
+    def _estimate_grammar_accuracy(self, word_count: int, agent_count: Optional[int] = None,
+                                   correction_count: int = 0) -> float:
         """Estimate grammar accuracy based on available information"""
         
         base_score = 0.8  # Assume decent grammar by default
         
         # If we have agent results, use them
-        if context and 'agent_results' in context:
-            grammar_results = context['agent_results'].get('grammar', {})
-            corrections = grammar_results.get('corrections', [])
-            
+        if agent_count is not None:
             # More corrections = lower initial accuracy
-            if corrections:
-                error_density = len(corrections) / max(1, len(text.split()) / 10)
+            if correction_count:
+                error_density = correction_count / max(1, word_count / 10)
                 grammar_score = max(0.3, 0.9 - error_density * 0.1)
             else:
                 grammar_score = 0.95
@@ -375,21 +479,23 @@ class QualityAnalyzer:
         
         return base_score
     
-    def _analyze_style_consistency(self, sentences: List[str]) -> float:
+    def _analyze_style_consistency(self, sentence_lengths: List[int], avg_length: float, tense_groups: List[set]) -> float:
         """Analyze style consistency"""
         
-        if len(sentences) < 2:
+        if len(sentence_lengths) < 2:
             return 1.0
         
         # Sentence length consistency
-        lengths = [len(s.split()) for s in sentences]
-        length_std = statistics.stdev(lengths) if len(lengths) > 1 else 0
-        length_consistency = max(0.5, 1.0 - (length_std / statistics.mean(lengths) if statistics.mean(lengths) > 0 else 1))
+        length_std = math.sqrt(
+            sum((length - avg_length) ** 2 for length in sentence_lengths) / (len(sentence_lengths) - 1)
+        )
+        length_consistency = max(0.5, 1.0 - (length_std / avg_length if avg_length > 0 else 1))
         
-        # Tense consistency (simplified)
-        present_tense = sum(1 for s in sentences if re.search(r'\b(es|está|tiene|hace)\b', s))
-        past_tense = sum(1 for s in sentences if re.search(r'\b(fue|estuvo|tuvo|hizo)\b', s))
-        future_tense = sum(1 for s in sentences if re.search(r'\b(será|estará|tendrá|hará)\b', s))
+        # Tense consistency (simplified): sentences using each tense, counted in one pass
+        tense_counts = Counter(tense for groups in tense_groups for tense in groups)
+        present_tense = tense_counts['present']
+        past_tense = tense_counts['past']
+        future_tense = tense_counts['future']
         
         total_tense = present_tense + past_tense + future_tense
         if total_tense > 0:
@@ -400,19 +506,14 @@ class QualityAnalyzer:
         
         return (length_consistency + tense_consistency) / 2
     
-    def _analyze_seo_quality(self, text: str, context: Dict[str, Any] = None) -> float:
+    def _analyze_seo_quality(self, word_count: int, seo_balance: Optional[float] = None) -> float:
         """Analyze SEO quality if relevant"""
         
-        # Check if SEO agent was used
-        if context and 'agent_results' in context:
-            seo_results = context['agent_results'].get('seo', {})
-            if seo_results:
-                # Use SEO agent's assessment
-                balance_score = seo_results.get('clarity_balance', {}).get('balance_score', 0.7)
-                return balance_score
+        # Use SEO agent's assessment when it was used
+        if seo_balance is not None:
+            return seo_balance
         
         # Basic SEO quality assessment
-        word_count = len(text.split())
         if 300 <= word_count <= 2000:  # Good length for web content
             return 0.8
         elif word_count < 100:
@@ -441,40 +542,36 @@ class QualityAnalyzer:
         
         return weighted_score / total_weight if total_weight > 0 else 0.5
     
-    def _calculate_confidence_level(self, text: str, context: Dict[str, Any] = None) -> float:
+    def _calculate_confidence_level(self, word_count: int, agent_count: Optional[int] = None) -> float:
         """Calculate confidence level of quality assessment"""
         
         confidence = 0.7  # Base confidence
         
         # More text = higher confidence
-        word_count = len(text.split())
         if word_count > 100:
             confidence += 0.2
         elif word_count < 20:
             confidence -= 0.2
         
         # Having agent context increases confidence
-        if context and 'agent_results' in context:
-            agent_count = len(context['agent_results'])
+        if agent_count is not None:
             confidence += min(0.2, agent_count * 0.05)
         
         return min(1.0, max(0.3, confidence))
     
-    def _calculate_improvement_potential(self, current_quality: float, context: Dict[str, Any] = None) -> float:
+    def _calculate_improvement_potential(self, current_quality: float, improvements_count: int = 0) -> float:
         """Calculate potential for further improvement"""
         
         # Higher current quality = lower improvement potential
         base_potential = 1.0 - current_quality
         
         # If we have improvement history, adjust based on recent improvements
-        if context and 'improvements' in context:
-            recent_improvements = len(context['improvements'])
-            if recent_improvements > 5:
-                base_potential *= 0.7  # Less potential if many improvements already made
+        if improvements_count > 5:
+            base_potential *= 0.7  # Less potential if many improvements already made
         
         return min(1.0, base_potential)
     
-    def _detect_quality_plateau(self, quality_history: List[QualityMetrics]) -> bool:
+    def _detect_quality_plateau(self, quality_history: List[CoreQualityMetrics]) -> bool:
         """Detect if quality has plateaued"""
         
         if len(quality_history) < 3:
@@ -485,7 +582,7 @@ class QualityAnalyzer:
         
         return score_range < self.convergence_thresholds['stability_threshold']
     
-    def _detect_stability(self, quality_history: List[QualityMetrics]) -> bool:
+    def _detect_stability(self, quality_history: List[CoreQualityMetrics]) -> bool:
         """Detect if quality is stable"""
         
         if len(quality_history) < 2:
@@ -507,7 +604,7 @@ class QualityAnalyzer:
     
     def _determine_convergence_status(self, 
                                     analysis: Dict[str, bool], 
-                                    current: QualityMetrics) -> Tuple[bool, str, float]:
+                                    current: CoreQualityMetrics) -> Tuple[bool, str, float]:
         """Determine if convergence has been achieved"""
         
         # High quality reached
@@ -528,7 +625,7 @@ class QualityAnalyzer:
     
     def _generate_convergence_recommendation(self, 
                                            analysis: Dict[str, bool], 
-                                           current: QualityMetrics,
+                                           current: CoreQualityMetrics,
                                            improvement_history: List[Dict[str, Any]]) -> str:
         """Generate recommendation based on convergence analysis"""
         
@@ -549,17 +646,30 @@ class QualityAnalyzer:
 class ConvergenceDetector:
     """Main convergence detection system"""
     
-    def __init__(self):
+    def __init__(self, analysis_cache_size: int = 128, history_size: int = 10):
         self.quality_analyzer = QualityAnalyzer()
-        self.quality_history: List[QualityMetrics] = []
-        self.improvement_history: List[Dict[str, Any]] = []
+        
+        # Bounded ring buffers: appending past history_size drops the oldest entry
+        self.quality_history: Deque[CoreQualityMetrics] = deque(maxlen=history_size)
+        self.improvement_history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        
+        # LRU memo of quality analyses keyed by text digest and context signature
+        self.analysis_cache_size = analysis_cache_size
+        self._analysis_cache: OrderedDict = OrderedDict()
+        
+        # Latest input, kept so the full metrics can be computed on request
+        self._last_input: Optional[Tuple[str, Dict[str, Any]]] = None
     
-    def add_processing_result(self, text: str, results: Dict[str, Any]) -> None:
-        """Add processing result to history"""
+    def add_processing_result(self, text: str, results: Dict[str, Any],
+                              quality_metrics: Optional[CoreQualityMetrics] = None) -> None:
+        """Add processing result to history, reusing the caller's analysis of this text and results if given"""
         
-        # Analyze quality
-        quality_metrics = self.quality_analyzer.analyze_comprehensive_quality(text, results)
+        # Analyze quality (core metrics only; convergence needs nothing else).
+        # Caller-supplied metrics go into the history only, never the memo
+        if quality_metrics is None:
+            quality_metrics = self._analyze_cached(text, results)
         self.quality_history.append(quality_metrics)
+        self._last_input = (text, results)
         
         # Store improvement information
         self.improvement_history.append({
@@ -567,27 +677,81 @@ class ConvergenceDetector:
             'agent_results': results.get('agent_results', {}),
             'timestamp': results.get('timestamp', 0)
         })
-        
-        # Keep only recent history (last 10 entries)
-        if len(self.quality_history) > 10:
-            self.quality_history.pop(0)
-            self.improvement_history.pop(0)
+    
+    def add_processing_results_batch(self, texts: List[str], results_list: List[Dict[str, Any]]) -> None:
+        """Add several processing results in order, analyzing the uncached texts as one batch"""
+        
+        keys = [self._cache_key(text, results) for text, results in zip(texts, results_list)]
+        pending = {}
+        for key, text, results in zip(keys, texts, results_list):
+            if key not in self._analysis_cache and key not in pending:
+                pending[key] = (text, results)
+        
+        if pending:
+            batch_texts = [text for text, _ in pending.values()]
+            batch_results = [results for _, results in pending.values()]
+            analyzed = self.quality_analyzer.analyze_core_quality_batch(batch_texts, batch_results)
+            for key, quality_metrics in zip(pending, analyzed):
+                self._analysis_cache[key] = quality_metrics
+        
+        for key, text, results in zip(keys, texts, results_list):
+            self._analysis_cache.move_to_end(key)
+            self.quality_history.append(self._analysis_cache[key])
+            self.improvement_history.append({
+                'improvements': results.get('improvements', []),
+                'agent_results': results.get('agent_results', {}),
+                'timestamp': results.get('timestamp', 0)
+            })
+            self._last_input = (text, results)
+        
+        while len(self._analysis_cache) > self.analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+    
+    def _cache_key(self, text: str, results: Dict[str, Any]) -> Tuple[bytes, Tuple]:
+        """Memo key: a 16-byte text digest, so cached entries don't keep whole documents alive"""
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        return digest, self.quality_analyzer._context_signature(results)
+    
+    def _analyze_cached(self, text: str, results: Dict[str, Any]) -> CoreQualityMetrics:
+        """Analyze quality, reusing the previous result for a repeated text and context"""
+        
+        key = self._cache_key(text, results)
+        quality_metrics = self._analysis_cache.get(key)
+        if quality_metrics is not None:
+            self._analysis_cache.move_to_end(key)
+            return quality_metrics
+        
+        quality_metrics = self.quality_analyzer.analyze_core_quality(text, results)
+        self._store_analysis(key, quality_metrics)
+        return quality_metrics
+    
+    def _store_analysis(self, key: Tuple[bytes, Tuple], quality_metrics: CoreQualityMetrics) -> None:
+        """Memoize an analysis as the most recent entry, evicting the oldest beyond the cache size"""
+        self._analysis_cache[key] = quality_metrics
+        self._analysis_cache.move_to_end(key)
+        if len(self._analysis_cache) > self.analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
     
     def check_convergence(self) -> Dict[str, Any]:
         """Check if processing has converged"""
         
         return self.quality_analyzer.detect_convergence(
-            self.quality_history,
-            self.improvement_history
+            self._recent(self.quality_history),
+            self._recent(self.improvement_history)
         )
     
+    @staticmethod
+    def _recent(history: Deque) -> List[Any]:
+        """Last CONVERGENCE_WINDOW entries, read from the end of the deque without copying it"""
+        return [history[i] for i in range(-min(CONVERGENCE_WINDOW, len(history)), 0)]
+    
     def get_quality_trend(self) -> Dict[str, Any]:
         """Get quality improvement trend"""
         
         if len(self.quality_history) < 2:
             return {'trend': 'insufficient_data', 'direction': 'unknown'}
         
-        recent_qualities = [q.overall_quality for q in self.quality_history[-3:]]
+        recent_qualities = [q.overall_quality for q in self._recent(self.quality_history)]
         
         if len(recent_qualities) >= 2:
             if recent_qualities[-1] > recent_qualities[-2]:
@@ -611,8 +775,10 @@ class ConvergenceDetector:
         """Reset convergence history"""
         self.quality_history.clear()
         self.improvement_history.clear()
+        self._analysis_cache.clear()
+        self._last_input = None
     
-    def get_detailed_analysis(self) -> Dict[str, Any]:
+    def get_detailed_analysis(self, include_full_metrics: bool = False) -> Dict[str, Any]:
         """Get detailed quality and convergence analysis"""
         
         if not self.quality_history:
@@ -622,7 +788,7 @@ class ConvergenceDetector:
         convergence = self.check_convergence()
         trend = self.get_quality_trend()
         
-        return {
+        analysis = {
             'status': 'analyzed',
             'current_metrics': {
                 'overall_quality': current.overall_quality,
@@ -635,8 +801,15 @@ class ConvergenceDetector:
             'quality_trend': trend,
             'recommendations': self._get_quality_recommendations(current, convergence)
         }
+        
+        if include_full_metrics:
+            analysis['full_metrics'] = asdict(
+                self.quality_analyzer.analyze_comprehensive_quality(*self._last_input)
+            )
+        
+        return analysis
     
-    def _get_quality_recommendations(self, current: QualityMetrics, convergence: Dict[str, Any]) -> List[str]:
+    def _get_quality_recommendations(self, current: CoreQualityMetrics, convergence: Dict[str, Any]) -> List[str]:
         """Get recommendations based on quality analysis"""
         
         recommendations = []
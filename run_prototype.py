@@ -7,7 +7,9 @@ import sys
 import os
 
 # Add current directory to path
-sys.path.append(os.path.dirname(__file__))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:  # Already first when run as a script
+    sys.path.insert(0, _HERE)
 
 def test_agents():
     """Test agents without external dependencies"""
@@ -3,18 +3,173 @@ Advanced SEO optimization while maintaining Spanish language clarity
 """
 
 import re
-from typing import Dict, List, Any, Tuple
-from collections import Counter
-import math
+import heapq
+import hashlib
+import threading
+from typing import Dict, List, Any
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache, cached_property
+from operator import itemgetter
+
+# Patterns shared by every analysis, compiled once at import
+# A sentence: text between terminators with at least one non-space character
+SENTENCE_BODY_RE = re.compile(r'[^.!?\s][^.!?]*')
+NON_WORD_RE = re.compile(r'[^\w\s]')
+LIST_ITEM_RE = re.compile(r'[-•*]\s')
+NUMBER_RE = re.compile(r'\d+')
+WWW_RE = re.compile(r'www\.[\w.-]+')
+
+# Fixed dictionaries counted as whole lowercase tokens, a hash lookup per entry
+ACTION_WORDS = ('hacer', 'crear', 'aprender', 'descubrir', 'obtener', 'lograr', 'conseguir', 'mejorar')
+TEMPORAL_WORDS = ('hoy', 'ayer', 'mañana', 'ahora', 'actual', 'nuevo', 'reciente', '2024', '2025')
+
+# Complex word: technical prefix or suffix, or longer than 12 characters
+COMPLEX_WORD_RE = re.compile(r'^(?:pre|anti|super|inter|trans)|(?:ción|sión|mente|idad|ismo)$|^.{13}')
+
+@lru_cache(maxsize=65536)
+def is_complex_spanish_word(word: str) -> bool:
+    """Whether a word counts as complex; memoized because vocabularies repeat across texts"""
+    return COMPLEX_WORD_RE.search(word) is not None
+
+# Spanish stop words for better keyword analysis
+SPANISH_STOP_WORDS = frozenset({
+    'el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le', 'da', 'su', 'por', 'son', 'con', 'para', 'al', 'del', 'los', 'las', 'una', 'pero', 'sus', 'muy', 'ser', 'ya', 'está', 'todo', 'esta', 'fue', 'han', 'más', 'como', 'si', 'mi', 'me', 'sin', 'sobre', 'este', 'años', 'entre', 'cuando', 'él', 'mismo', 'tanto', 'otros', 'hasta', 'ni', 'contra', 'ese', 'eso', 'durante', 'también', 'cada', 'menos', 'hacer', 'desde', 'nos', 'vez', 'solo', 'otra', 'donde', 'quien', 'uno', 'cual', 'todos', 'antes'
+})
+
+@dataclass(slots=True)
+class StructureAnalysis:
+    """Text structure metrics for SEO"""
+    
+    word_count: int
+    sentence_count: int
+    paragraph_count: int
+    avg_sentence_length: float
+    avg_paragraph_length: float
+    potential_headings: List[str]
+    structure_score: float
+
+@dataclass(slots=True)
+class KeywordAnalysis:
+    """Keyword frequency, density and suggestions"""
+    
+    total_words: int
+    unique_words: int
+    target_keywords: Dict[str, Dict[str, Any]]
+    potential_keywords: List[Dict[str, Any]]
+    keyword_diversity: float
+
+@dataclass(slots=True)
+class ReadabilityAnalysis:
+    """Readability metrics with SEO considerations"""
+    
+    readability_score: float
+    seo_readability: str
+    avg_sentence_length: float
+    complex_word_ratio: float
+    recommended_sentence_length: int
+
+@dataclass(slots=True)
+class ContentAnalysis:
+    """Content depth, engagement and paragraph structure"""
+    
+    content_depth_score: float
+    engagement_score: float
+    structure_score: float
+    questions: int
+    lists: int
+    action_words: int
+    avg_paragraph_length: float
+
+@dataclass(slots=True)
+class TechnicalAnalysis:
+    """Links, formatting and freshness signals"""
+    
+    external_links: int
+    www_references: int
+    formatting_elements: int
+    temporal_relevance: int
+    technical_score: float
+
+@dataclass(slots=True)
+class SEOAnalysis:
+    """Complete SEO analysis; asdict() gives the public dictionary form"""
+    
+    text_structure: StructureAnalysis
+    keyword_analysis: KeywordAnalysis
+    readability_seo: ReadabilityAnalysis
+    content_quality: ContentAnalysis
+    technical_seo: TechnicalAnalysis
+    recommendations: List[Dict[str, str]] = field(default_factory=list)
+    seo_score: Dict[str, float] = field(default_factory=dict)
+
+class _Tokens:
+    """Text split on first use, once, and shared by every SEO analyzer and suggester"""
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    @cached_property
+    def words(self) -> List[str]:
+        """Whitespace-separated words"""
+        return self.text.split()
+    
+    @cached_property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words, computed once for every analyzer"""
+        return len(self.words)
+    
+    @cached_property
+    def sentence_count(self) -> int:
+        """Number of non-blank sentences"""
+        return sum(1 for _ in SENTENCE_BODY_RE.finditer(self.text))
+    
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        """Non-blank paragraphs, stripped"""
+        return [p for p in map(str.strip, self.text.split('\n\n')) if p]
+    
+    @cached_property
+    def lower(self) -> str:
+        """Lowercase text, case-folded once for every analyzer"""
+        return self.text.lower()
+    
+    @cached_property
+    def lower_clean(self) -> str:
+        """Lowercase text with punctuation replaced by spaces"""
+        return NON_WORD_RE.sub(' ', self.lower)
+    
+    @cached_property
+    def lower_tokens(self) -> List[str]:
+        """Lowercase word tokens, punctuation removed"""
+        return self.lower_clean.split()
+    
+    @cached_property
+    def token_counts(self) -> Counter:
+        """Occurrences of each lowercase word token"""
+        return Counter(self.lower_tokens)
+    
+    @cached_property
+    def first_sentence(self) -> str:
+        """Text up to the first period, or the first 100 characters without one"""
+        return self.text.partition('.')[0] if '.' in self.text else self.text[:100]
+    
+    @cached_property
+    def first_paragraph(self) -> str:
+        """Text up to the first blank line, or the first 200 characters without one"""
+        return self.text.partition('\n\n')[0] if '\n\n' in self.text else self.text[:200]
 
 class AdvancedSEOOptimizer:
     """Advanced SEO optimization with Spanish language considerations"""
     
-    def __init__(self):
-        # Spanish stop words for better keyword analysis
-        self.spanish_stop_words = {
-            'el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le', 'da', 'su', 'por', 'son', 'con', 'para', 'al', 'del', 'los', 'las', 'una', 'pero', 'sus', 'muy', 'ser', 'ya', 'está', 'todo', 'esta', 'fue', 'han', 'más', 'como', 'si', 'mi', 'me', 'sin', 'sobre', 'este', 'años', 'entre', 'cuando', 'él', 'mismo', 'tanto', 'otros', 'hasta', 'ni', 'contra', 'ese', 'eso', 'durante', 'también', 'cada', 'menos', 'hacer', 'desde', 'nos', 'vez', 'solo', 'otra', 'donde', 'quien', 'uno', 'cual', 'todos', 'antes'
-        }
+    spanish_stop_words = SPANISH_STOP_WORDS
+    
+    def __init__(self, analysis_cache_size: int = 128):
+        # LRU memo of comprehensive analyses keyed by text digest and target
+        # keywords, shared by every thread using this optimizer
+        self.analysis_cache_size = analysis_cache_size
+        self._analysis_cache: OrderedDict = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
         
         # SEO best practices for Spanish content
         self.seo_guidelines = {
@@ -27,61 +182,128 @@ class AdvancedSEOOptimizer:
     
     def analyze_seo_comprehensive(self, text: str, target_keywords: List[str] = None) -> Dict[str, Any]:
         """Comprehensive SEO analysis of Spanish text"""
-        
-        analysis = {
-            'text_structure': self._analyze_text_structure(text),
-            'keyword_analysis': self._analyze_keywords(text, target_keywords or []),
-            'readability_seo': self._analyze_readability_for_seo(text),
-            'content_quality': self._analyze_content_quality(text),
-            'technical_seo': self._analyze_technical_aspects(text),
-            'recommendations': []
-        }
+        return asdict(self._analyze_seo_cached(text, target_keywords))
+    
+    def _analyze_seo_cached(self, text: str, target_keywords: List[str] = None,
+                            tokens: _Tokens = None) -> SEOAnalysis:
+        """Analyze text, reusing the previous result for repeated text and keywords"""
+        
+        # A 16-byte digest, so cached entries don't keep whole documents alive
+        key = (hashlib.blake2b(text.encode(), digest_size=16).digest(), tuple(target_keywords or ()))
+        with self._analysis_cache_lock:
+            analysis = self._analysis_cache.get(key)
+            if analysis is not None:
+                self._analysis_cache.move_to_end(key)
+                return analysis
+        
+        # Analyze outside the lock; concurrent misses on one text just repeat the work
+        analysis = self._analyze_seo_uncached(tokens or _Tokens(text), target_keywords)
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = analysis
+            self._analysis_cache.move_to_end(key)
+            if len(self._analysis_cache) > self.analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+        return analysis
+    
+    def _analyze_seo_uncached(self, tokens: _Tokens, target_keywords: List[str] = None) -> SEOAnalysis:
+        """Run every SEO analyzer on the tokenized text"""
+        
+        analysis = SEOAnalysis(
+            text_structure=self._analyze_text_structure(tokens),
+            keyword_analysis=self._analyze_keywords(tokens, target_keywords or []),
+            readability_seo=self._analyze_readability_for_seo(tokens),
+            content_quality=self._analyze_content_quality(tokens),
+            technical_seo=self._analyze_technical_aspects(tokens)
+        )
         
         # Generate comprehensive recommendations
-        analysis['recommendations'] = self._generate_seo_recommendations(analysis)
-        analysis['seo_score'] = self._calculate_seo_score(analysis)
+        analysis.recommendations = self._generate_seo_recommendations(analysis)
+        analysis.seo_score = self._calculate_seo_score(analysis)
         
         return analysis
     
-    def _analyze_text_structure(self, text: str) -> Dict[str, Any]:
+    def _analyze_text_structure(self, tokens: _Tokens) -> StructureAnalysis:
         """Analyze text structure for SEO"""
         
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
-        words = text.split()
+        paragraphs = tokens.paragraphs
+        sentence_count = tokens.sentence_count
+        word_count = tokens.word_count
         
-        # Detect potential headings (lines that are shorter and may be titles)
+        # Detect potential headings (lines that are shorter and may be titles);
+        # the bounded split stops once the paragraph is known to be too long
         potential_headings = []
         for para in paragraphs:
-            if len(para) < 80 and not para.endswith('.') and len(para.split()) < 15:
+            if len(para) < 80 and not para.endswith('.') and len(para.split(maxsplit=14)) < 15:
                 potential_headings.append(para)
         
-        return {
-            'word_count': len(words),
-            'sentence_count': len(sentences),
-            'paragraph_count': len(paragraphs),
-            'avg_sentence_length': len(words) / len(sentences) if sentences else 0,
-            'avg_paragraph_length': len(words) / len(paragraphs) if paragraphs else 0,
-            'potential_headings': potential_headings,
-            'structure_score': self._score_text_structure(len(words), len(sentences), len(paragraphs))
-        }
+        return StructureAnalysis(
+            word_count=word_count,
+            sentence_count=sentence_count,
+            paragraph_count=len(paragraphs),
+            avg_sentence_length=word_count / sentence_count if sentence_count else 0,
+            avg_paragraph_length=word_count / len(paragraphs) if paragraphs else 0,
+            potential_headings=potential_headings,
+            structure_score=self._score_text_structure(word_count, sentence_count, len(paragraphs))
+        )
     
-    def _analyze_keywords(self, text: str, target_keywords: List[str]) -> Dict[str, Any]:
+    def _analyze_keywords(self, tokens: _Tokens, target_keywords: List[str]) -> KeywordAnalysis:
         """Advanced keyword analysis for Spanish text"""
         
-        # Clean and tokenize text
-        clean_text = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = [word for word in clean_text.split() if word not in self.spanish_stop_words and len(word) > 2]
+        # Clean and tokenize text, counting every token once
+        all_tokens = tokens.lower_tokens
+        token_freq = tokens.token_counts
+        
+        # Word frequency analysis over meaningful words: copy the counts and delete
+        # stop words (one set intersection) and short words; deletion keeps the
+        # first-seen order used for ties
+        excluded = token_freq.keys() & SPANISH_STOP_WORDS
+        excluded.update(word for word in token_freq if len(word) < 3)
+        word_freq = token_freq.copy()
+        for word in excluded:
+            del word_freq[word]
+        total_words = sum(word_freq.values())
+        
+        # Analyze target keywords if provided (the common no-keyword call skips it)
+        target_analysis = (
+            self._analyze_target_keywords(all_tokens, token_freq, total_words, target_keywords)
+            if target_keywords else {}
+        )
+        
+        # Find potential keywords (the ten most frequent words longer than three letters)
+        # nlargest with a key is stable, so ties keep first-seen order as most_common did
+        top_candidates = heapq.nlargest(
+            10, ((word, freq) for word, freq in word_freq.items() if len(word) > 3), key=itemgetter(1)
+        )
+        potential_keywords = [
+            {'word': word, 'frequency': freq, 'density': freq/total_words*100}
+            for word, freq in top_candidates
+        ]
         
-        # Word frequency analysis
-        word_freq = Counter(words)
-        total_words = len(words)
+        return KeywordAnalysis(
+            total_words=total_words,
+            unique_words=len(word_freq),
+            target_keywords=target_analysis,
+            potential_keywords=potential_keywords,
+            keyword_diversity=len(word_freq) / total_words if total_words > 0 else 0
+        )
+    
+    def _analyze_target_keywords(self, all_tokens: List[str], token_freq: Counter,
+                                 total_words: int, target_keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Count and score each target keyword (n-grams are counted on a copy of token_freq)"""
+        
+        # Target keywords match whole tokens; multi-word keywords are looked up
+        # in n-gram counts built only for the lengths actually requested
+        keyword_phrases = {
+            keyword: ' '.join(NON_WORD_RE.sub(' ', keyword.lower()).split()) for keyword in target_keywords
+        }
+        phrase_lengths = {phrase.count(' ') + 1 for phrase in keyword_phrases.values() if ' ' in phrase}
+        phrase_freq = token_freq.copy() if phrase_lengths else token_freq
+        for n in phrase_lengths:
+            phrase_freq.update(' '.join(all_tokens[i:i + n]) for i in range(len(all_tokens) - n + 1))
         
-        # Analyze target keywords if provided
         target_analysis = {}
-        for keyword in target_keywords:
-            keyword_lower = keyword.lower()
-            count = clean_text.count(keyword_lower)
+        for keyword, phrase in keyword_phrases.items():
+            count = phrase_freq[phrase] if phrase else 0
             density = (count / total_words * 100) if total_words > 0 else 0
             
             target_analysis[keyword] = {
@@ -90,36 +312,23 @@ class AdvancedSEOOptimizer:
                 'optimal': self.seo_guidelines['keyword_density']['min'] <= density <= self.seo_guidelines['keyword_density']['max']
             }
         
-        # Find potential keywords (most frequent meaningful words)
-        potential_keywords = [
-            {'word': word, 'frequency': freq, 'density': freq/total_words*100}
-            for word, freq in word_freq.most_common(10)
-            if len(word) > 3
-        ]
-        
-        return {
-            'total_words': total_words,
-            'unique_words': len(word_freq),
-            'target_keywords': target_analysis,
-            'potential_keywords': potential_keywords,
-            'keyword_diversity': len(word_freq) / total_words if total_words > 0 else 0
-        }
+        return target_analysis
     
-    def _analyze_readability_for_seo(self, text: str) -> Dict[str, Any]:
+    def _analyze_readability_for_seo(self, tokens: _Tokens) -> ReadabilityAnalysis:
         """Analyze readability with SEO considerations"""
         
-        sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
-        words = text.split()
+        sentence_count = tokens.sentence_count
+        word_count = tokens.word_count
         
-        if not sentences or not words:
-            return {'readability_score': 0, 'seo_readability': 'poor'}
+        if not sentence_count or not word_count:
+            return ReadabilityAnalysis(0, 'poor', 0, 0, self.seo_guidelines['sentence_length']['optimal'])
         
         # Calculate metrics
-        avg_sentence_length = len(words) / len(sentences)
+        avg_sentence_length = word_count / sentence_count
         
-        # Spanish readability considerations
-        complex_words = self._count_complex_spanish_words(words)
-        complex_word_ratio = complex_words / len(words)
+        # Spanish readability considerations (the only analyzer that needs the words themselves)
+        complex_words = self._count_complex_spanish_words(tokens.words)
+        complex_word_ratio = complex_words / word_count
         
         # SEO readability score (simplified)
         readability_score = 100
@@ -143,75 +352,76 @@ class AdvancedSEOOptimizer:
         else:
             seo_readability = 'poor'
         
-        return {
-            'readability_score': readability_score / 100,
-            'seo_readability': seo_readability,
-            'avg_sentence_length': avg_sentence_length,
-            'complex_word_ratio': complex_word_ratio,
-            'recommended_sentence_length': self.seo_guidelines['sentence_length']['optimal']
-        }
+        return ReadabilityAnalysis(
+            readability_score=readability_score / 100,
+            seo_readability=seo_readability,
+            avg_sentence_length=avg_sentence_length,
+            complex_word_ratio=complex_word_ratio,
+            recommended_sentence_length=self.seo_guidelines['sentence_length']['optimal']
+        )
     
-    def _analyze_content_quality(self, text: str) -> Dict[str, Any]:
+    def _analyze_content_quality(self, tokens: _Tokens) -> ContentAnalysis:
         """Analyze content quality for SEO"""
         
+        text = tokens.text
+        
         # Content depth indicators
-        questions = len(re.findall(r'\?', text))
-        lists = len(re.findall(r'[-•*]\s', text))
-        numbers = len(re.findall(r'\d+', text))
+        questions = text.count('?')
+        lists = len(LIST_ITEM_RE.findall(text))
+        numbers = len(NUMBER_RE.findall(text))
         
         # Engagement indicators
-        exclamations = len(re.findall(r'!', text))
-        action_words = len(re.findall(r'\b(hacer|crear|aprender|descubrir|obtener|lograr|conseguir|mejorar)\b', text.lower()))
+        exclamations = text.count('!')
+        token_counts = tokens.token_counts
+        action_words = sum(token_counts[word] for word in ACTION_WORDS)
         
         # Content structure
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        avg_paragraph_length = len(text.split()) / len(paragraphs) if paragraphs else 0
-        
-        return {
-            'content_depth_score': min(1.0, (questions + lists + numbers) / 10),
-            'engagement_score': min(1.0, (exclamations + action_words) / 5),
-            'structure_score': 1.0 if 50 <= avg_paragraph_length <= 200 else 0.6,
-            'questions': questions,
-            'lists': lists,
-            'action_words': action_words,
-            'avg_paragraph_length': avg_paragraph_length
-        }
+        paragraphs = tokens.paragraphs
+        avg_paragraph_length = tokens.word_count / len(paragraphs) if paragraphs else 0
+        
+        return ContentAnalysis(
+            content_depth_score=min(1.0, (questions + lists + numbers) / 10),
+            engagement_score=min(1.0, (exclamations + action_words) / 5),
+            structure_score=1.0 if 50 <= avg_paragraph_length <= 200 else 0.6,
+            questions=questions,
+            lists=lists,
+            action_words=action_words,
+            avg_paragraph_length=avg_paragraph_length
+        )
     
-    def _analyze_technical_aspects(self, text: str) -> Dict[str, Any]:
+    def _analyze_technical_aspects(self, tokens: _Tokens) -> TechnicalAnalysis:
         """Analyze technical SEO aspects"""
         
-        # URL/Link detection
-        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text)
-        www_links = re.findall(r'www\.[\w.-]+', text)
+        text = tokens.text
         
-        # Special characters and formatting
-        bold_indicators = text.count('**') // 2  # Markdown bold
-        italic_indicators = text.count('*') - (bold_indicators * 2)
+        # URL/Link detection
+        external_links = text.count('http://') + text.count('https://')
+        www_links = WWW_RE.findall(text)
+        
+        # Special characters and formatting: two C-level scans, the second only
+        # when stars are present; a Markdown bold span uses two '**' markers
+        stars = text.count('*')
+        bold_markers = text.count('**') if stars > 1 else 0
+        bold_indicators = bold_markers // 2  # Markdown bold
+        italic_indicators = stars - bold_markers * 2
         formatting_elements = bold_indicators + italic_indicators
         
         # Content freshness indicators (dates, temporal words)
-        temporal_words = len(re.findall(r'\b(hoy|ayer|mañana|ahora|actual|nuevo|reciente|2024|2025)\b', text.lower()))
-        
-        return {
-            'external_links': len(urls),
-            'www_references': len(www_links),
-            'formatting_elements': formatting_elements,
-            'temporal_relevance': temporal_words,
-            'technical_score': min(1.0, (len(urls) + formatting_elements + temporal_words) / 10)
-        }
+        token_counts = tokens.token_counts
+        temporal_words = sum(token_counts[word] for word in TEMPORAL_WORDS)
+        
+        return TechnicalAnalysis(
+            external_links=external_links,
+            www_references=len(www_links),
+            formatting_elements=formatting_elements,
+            temporal_relevance=temporal_words,
+            technical_score=min(1.0, (external_links + formatting_elements + temporal_words) / 10)
+        )
     
     def _count_complex_spanish_words(self, words: List[str]) -> int:
         """Count complex words in Spanish text"""
-        complex_count = 0
-        
-        for word in words:
-            # Consider words with 4+ syllables or technical terms as complex
-            if (len(word) > 12 or 
-                word.endswith(('ción', 'sión', 'mente', 'idad', 'ismo')) or
-                word.startswith(('pre', 'anti', 'super', 'inter', 'trans'))):
-                complex_count += 1
-        
-        return complex_count
+        # map over the memoized predicate keeps the whole loop in C once words are cached
+        return sum(map(is_complex_spanish_word, words))
     
     def _score_text_structure(self, words: int, sentences: int, paragraphs: int) -> float:
         """Score text structure for SEO"""
@@ -233,24 +443,23 @@ class AdvancedSEOOptimizer:
         
         return min(1.0, score)
     
-    def _generate_seo_recommendations(self, analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    def _generate_seo_recommendations(self, analysis: SEOAnalysis) -> List[Dict[str, str]]:
         """Generate SEO improvement recommendations"""
         recommendations = []
         
         # Structure recommendations
-        structure = analysis['text_structure']
-        if structure['avg_sentence_length'] > 25:
+        structure = analysis.text_structure
+        if structure.avg_sentence_length > 25:
             recommendations.append({
                 'type': 'structure',
                 'priority': 'high',
                 'issue': 'Oraciones muy largas afectan SEO',
-                'recommendation': f'Reducir longitud promedio de oraciones de {structure["avg_sentence_length"]:.1f} a menos de 25 palabras',
+                'recommendation': f'Reducir longitud promedio de oraciones de {structure.avg_sentence_length:.1f} a menos de 25 palabras',
                 'seo_impact': 'Mejora legibilidad y tiempo de permanencia'
             })
         
         # Keyword recommendations
-        keyword_analysis = analysis['keyword_analysis']
-        for keyword, data in keyword_analysis['target_keywords'].items():
+        for keyword, data in analysis.keyword_analysis.target_keywords.items():
             if not data['optimal']:
                 if data['density'] < 0.5:
                     recommendations.append({
@@ -270,19 +479,18 @@ class AdvancedSEOOptimizer:
                     })
         
         # Readability recommendations
-        readability = analysis['readability_seo']
-        if readability['seo_readability'] in ['fair', 'poor']:
+        readability = analysis.readability_seo
+        if readability.seo_readability in ['fair', 'poor']:
             recommendations.append({
                 'type': 'readability',
                 'priority': 'high',
-                'issue': f'Legibilidad SEO {readability["seo_readability"]}',
+                'issue': f'Legibilidad SEO {readability.seo_readability}',
                 'recommendation': 'Simplificar vocabulario y reducir longitud de oraciones',
                 'seo_impact': 'Mejor experiencia de usuario y tiempo de permanencia'
             })
         
         # Content quality recommendations
-        content = analysis['content_quality']
-        if content['engagement_score'] < 0.3:
+        if analysis.content_quality.engagement_score < 0.3:
             recommendations.append({
                 'type': 'engagement',
                 'priority': 'medium',
@@ -293,7 +501,7 @@ class AdvancedSEOOptimizer:
         
         return recommendations
     
-    def _calculate_seo_score(self, analysis: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_seo_score(self, analysis: SEOAnalysis) -> Dict[str, float]:
         """Calculate overall SEO score"""
         
         # Weight different aspects
@@ -303,19 +511,20 @@ class AdvancedSEOOptimizer:
         content_weight = 0.20
         
         # Get individual scores
-        structure_score = analysis['text_structure']['structure_score']
+        structure_score = analysis.text_structure.structure_score
         
         # Keyword score (average of target keyword optimization)
-        keyword_scores = [data['density'] / 2.0 for data in analysis['keyword_analysis']['target_keywords'].values()]
+        keyword_scores = [data['density'] / 2.0 for data in analysis.keyword_analysis.target_keywords.values()]
         keyword_score = sum(keyword_scores) / len(keyword_scores) if keyword_scores else 0.5
         keyword_score = min(1.0, keyword_score)
         
-        readability_score = analysis['readability_seo']['readability_score']
+        readability_score = analysis.readability_seo.readability_score
         
+        content = analysis.content_quality
         content_score = (
-            analysis['content_quality']['content_depth_score'] +
-            analysis['content_quality']['engagement_score'] +
-            analysis['content_quality']['structure_score']
+            content.content_depth_score +
+            content.engagement_score +
+            content.structure_score
         ) / 3
         
         # Calculate weighted overall score
@@ -337,28 +546,29 @@ class AdvancedSEOOptimizer:
     def optimize_for_seo(self, text: str, target_keywords: List[str] = None) -> Dict[str, Any]:
         """Provide specific SEO optimizations"""
         
-        analysis = self.analyze_seo_comprehensive(text, target_keywords)
+        tokens = _Tokens(text)
+        analysis = self._analyze_seo_cached(text, target_keywords, tokens)
         
         # Generate specific optimization suggestions
         optimizations = {
-            'title_suggestions': self._suggest_seo_titles(text, target_keywords or []),
-            'meta_description_suggestions': self._suggest_meta_descriptions(text, target_keywords or []),
-            'content_improvements': self._suggest_content_improvements(text, analysis),
-            'keyword_integration': self._suggest_keyword_integration(text, target_keywords or [])
+            'title_suggestions': self._suggest_seo_titles(tokens, target_keywords or []),
+            'meta_description_suggestions': self._suggest_meta_descriptions(tokens, target_keywords or []),
+            'content_improvements': self._suggest_content_improvements(tokens, analysis),
+            'keyword_integration': self._suggest_keyword_integration(tokens, target_keywords or [])
         }
         
         return {
-            'analysis': analysis,
+            'analysis': asdict(analysis),
             'optimizations': optimizations,
             'priority_actions': self._get_priority_actions(analysis)
         }
     
-    def _suggest_seo_titles(self, text: str, keywords: List[str]) -> List[str]:
+    def _suggest_seo_titles(self, tokens: _Tokens, keywords: List[str]) -> List[str]:
         """Suggest SEO-optimized titles"""
         suggestions = []
         
         # Extract main topic (first sentence or paragraph)
-        first_sentence = text.split('.')[0] if '.' in text else text[:100]
+        first_sentence = tokens.first_sentence
         
         # Create title variations
         if keywords:
@@ -373,12 +583,12 @@ class AdvancedSEOOptimizer:
         
         return suggestions[:5]
     
-    def _suggest_meta_descriptions(self, text: str, keywords: List[str]) -> List[str]:
+    def _suggest_meta_descriptions(self, tokens: _Tokens, keywords: List[str]) -> List[str]:
         """Suggest SEO-optimized meta descriptions"""
         suggestions = []
         
         # Extract key information from first paragraph
-        first_para = text.split('\n\n')[0] if '\n\n' in text else text[:200]
+        first_para = tokens.first_paragraph
         
         # Create meta description variations
         base_description = first_para[:120] + "..."
@@ -392,28 +602,27 @@ class AdvancedSEOOptimizer:
         
         return [desc for desc in suggestions if len(desc) <= 160][:3]
     
-    def _suggest_content_improvements(self, text: str, analysis: Dict[str, Any]) -> List[str]:
+    def _suggest_content_improvements(self, tokens: _Tokens, analysis: SEOAnalysis) -> List[str]:
         """Suggest content improvements for SEO"""
         improvements = []
         
-        readability = analysis['readability_seo']
-        if readability['avg_sentence_length'] > 25:
-            improvements.append(f"Dividir oraciones largas (promedio: {readability['avg_sentence_length']:.1f} palabras)")
+        readability = analysis.readability_seo
+        if readability.avg_sentence_length > 25:
+            improvements.append(f"Dividir oraciones largas (promedio: {readability.avg_sentence_length:.1f} palabras)")
         
-        content = analysis['content_quality']
-        if content['questions'] == 0:
+        content = analysis.content_quality
+        if content.questions == 0:
             improvements.append("Añadir preguntas para mejorar engagement")
         
-        if content['lists'] == 0:
+        if content.lists == 0:
             improvements.append("Incluir listas con viñetas para mejor estructura")
         
-        structure = analysis['text_structure']
-        if len(structure['potential_headings']) == 0:
+        if len(analysis.text_structure.potential_headings) == 0:
             improvements.append("Agregar subtítulos (H2, H3) para mejor estructura")
         
         return improvements
     
-    def _suggest_keyword_integration(self, text: str, keywords: List[str]) -> Dict[str, List[str]]:
+    def _suggest_keyword_integration(self, tokens: _Tokens, keywords: List[str]) -> Dict[str, List[str]]:
         """Suggest how to better integrate keywords"""
         suggestions = {}
         
@@ -432,11 +641,11 @@ class AdvancedSEOOptimizer:
         
         return suggestions
     
-    def _get_priority_actions(self, analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+    def _get_priority_actions(self, analysis: SEOAnalysis) -> List[Dict[str, str]]:
         """Get top priority SEO actions"""
         actions = []
         
-        scores = analysis['seo_score']
+        scores = analysis.seo_score
         
         # Prioritize based on lowest scores
         if scores['readability'] < 0.6:
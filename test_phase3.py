@@ -5,9 +5,15 @@ Test Phase 3 implementation - Knowledge Base Integration
 
 import sys
 import os
+import logging
 
 # Add current directory to path
-sys.path.append(os.path.dirname(__file__))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:  # Already first when run as a script
+    sys.path.insert(0, _HERE)
+
+# Tracebacks are logged at DEBUG level, shown only when run with --verbose
+log = logging.getLogger(__name__)
 
 def test_knowledge_integration():
     """Test the knowledge base integration with agents"""
@@ -87,8 +93,7 @@ def test_knowledge_integration():
         
     except Exception as e:
         print(f"❌ Error in Phase 3 testing: {e}")
-        import traceback
-        traceback.print_exc()
+        log.debug("Phase 3 integration test failed", exc_info=True)
         return False
 
 def test_mock_knowledge_base():
@@ -130,6 +135,8 @@ def test_mock_knowledge_base():
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if "--verbose" in sys.argv[1:] else logging.INFO)
+    
     print("🚀 Phase 3 Testing Suite")
     print("="*60)
     
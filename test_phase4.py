@@ -5,446 +5,542 @@ Comprehensive test suite for Phase 4 - Optimization & Advanced Features
 
 import sys
 import os
+import logging
+import io
+import importlib
 import time
-import uuid
+import secrets
+import threading
+import unittest
+from time import perf_counter_ns
+from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor
 
 # Add current directory to path
-sys.path.append(os.path.dirname(__file__))
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:  # Already first when run as a script
+    sys.path.insert(0, _HERE)
+
+# Tracebacks are logged at DEBUG level, shown only when run with --verbose
+log = logging.getLogger(__name__)
+
+# Durations use the monotonic nanosecond clock; wall-clock time.time() is
+# coarse on some platforms and jumps with NTP adjustments
+from performance_optimizer import NS_PER_SECOND
+
+# Thread pool for a suite run, created by run_comprehensive_phase4_tests: it
+# runs the tests and any batch work they start, so threads are created once.
+# A test run on its own (e.g. collected by pytest) sees None and its batch
+# work gets a pool of its own
+_EXECUTOR = None
+
+# Modules under test, imported once before the tests fan out to threads
+PHASE4_MODULES = (
+    'agent_coordinator', 'multi_pass_processor', 'seo_optimizer', 'performance_optimizer',
+    'feedback_system', 'quality_analyzer', 'analytics_dashboard'
+)
+
+@lru_cache(maxsize=None)
+def _load_module(name):
+    """Import a module under test once; a missing module skips the tests that need it"""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise unittest.SkipTest(f"module missing: {e}")
+
+def _new_coordinator():
+    """Private coordinator for a test that patches its agents"""
+    return _load_module('agent_coordinator').AgentCoordinator(use_knowledge_base=True)
+
+@lru_cache(maxsize=1)
+def _get_coordinator():
+    """Shared coordinator, built once per run; tests running concurrently only
+    read it, so a test that patches agents must use _new_coordinator() instead"""
+    return _new_coordinator()
+
+class _ThreadBufferedStdout:
+    """Stdout proxy that routes each worker thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, data):
+        return getattr(self._local, 'buffer', self.stream).write(data)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def bind(self, func):
+        """Wrap func so it prints into the calling thread's buffer from whichever thread runs it"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return func
+        
+        @wraps(func)
+        def run(*args, **kwargs):
+            previous = getattr(self._local, 'buffer', None)
+            self._local.buffer = buffer
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if previous is None:
+                    del self._local.buffer
+                else:
+                    self._local.buffer = previous
+        return run
+    
+    def capture(self, test_func):
+        """Run a test in the calling thread, returning its outcome and printed output"""
+        self._local.buffer = io.StringIO()
+        try:
+            outcome = test_func()
+        except unittest.SkipTest as e:
+            outcome = e
+        except Exception as e:
+            log.debug("%s raised", test_func.__name__, exc_info=True)
+            outcome = e
+        finally:
+            output = self._local.buffer.getvalue()
+            del self._local.buffer
+        return outcome, output
+
+class _BufferedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool whose tasks print into the buffer of the test that submitted them"""
+    
+    def __init__(self, stdout, **kwargs):
+        super().__init__(**kwargs)
+        self.stdout = stdout
+    
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(self.stdout.bind(fn), *args, **kwargs)
 
 def test_multi_pass_refinement():
     """Test multi-pass refinement system"""
     print("🔄 Testing Multi-Pass Refinement System")
     print("-" * 50)
     
-    try:
-        from agent_coordinator import AgentCoordinator
-        from multi_pass_processor import MultiPassProcessor, AdvancedProcessingOptions
-        
-        # Initialize components
-        coordinator = AgentCoordinator(use_knowledge_base=True)
-        options = AdvancedProcessingOptions()
+    MultiPassProcessor = _load_module('multi_pass_processor').MultiPassProcessor
+    AdvancedProcessingOptions = _load_module('multi_pass_processor').AdvancedProcessingOptions
+    
+    # Initialize components
+    coordinator = _get_coordinator()
+    options = AdvancedProcessingOptions()
+    
+    # Test different processing modes
+    modes = ['conservative', 'balanced', 'aggressive']
+    test_text = "Este texto es muy largo y complejo que que tiene más de treinta palabras en esta oración y utiliza vocabulario técnico que podría ser difícil de entender para los usuarios normales y necesita mejoras significativas."
+    
+    print(f"📝 Test text: {test_text[:80]}...")
+    print()
+    
+    for mode in modes:
+        print(f"🎛 Testing {mode} mode:")
         
-        # Test different processing modes
-        modes = ['conservative', 'balanced', 'aggressive']
-        test_text = "Este texto es muy largo y complejo que que tiene más de treinta palabras en esta oración y utiliza vocabulario técnico que podría ser difícil de entender para los usuarios normales y necesita mejoras significativas."
+        processor = options.create_custom_processor(coordinator, mode)
+        results = processor.process_with_multiple_passes(test_text)
         
-        print(f"📝 Test text: {test_text[:80]}...")
+        metrics = results['overall_metrics']
+        print(f"   ✅ Passes: {metrics['total_passes']}")
+        print(f"   ⏱ Time: {metrics['total_time']:.1f}s")
+        print(f"   📊 Quality: {metrics['initial_quality']:.1%} → {metrics['final_quality']:.1%}")
+        print(f"   🔧 Improvements: {metrics['total_improvements']}")
         print()
-        
-        for mode in modes:
-            print(f"🎛 Testing {mode} mode:")
-            
-            processor = options.create_custom_processor(coordinator, mode)
-            results = processor.process_with_multiple_passes(test_text)
-            
-            metrics = results['overall_metrics']
-            print(f"   ✅ Passes: {metrics['total_passes']}")
-            print(f"   ⏱ Time: {metrics['total_time']:.1f}s")
-            print(f"   📊 Quality: {metrics['initial_quality']:.1%} → {metrics['final_quality']:.1%}")
-            print(f"   🔧 Improvements: {metrics['total_improvements']}")
-            print()
-        
-        print("✅ Multi-pass refinement system working!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error in multi-pass testing: {e}")
-        return False
+    
+    # Sentence-level mode reuses the results of sentences a pass left unchanged
+    print("🧩 Testing sentence-level mode:")
+    processor = MultiPassProcessor(coordinator, sentence_level=True)
+    results = processor.process_with_multiple_passes(test_text)
+    print(f"   ✅ Passes: {results['overall_metrics']['total_passes']}")
+    print()
+    
+    print("✅ Multi-pass refinement system working!")
+    return True
 
 def test_advanced_seo_optimizer():
     """Test advanced SEO optimization features"""
     print("🔍 Testing Advanced SEO Optimizer")
     print("-" * 50)
     
-    try:
-        from seo_optimizer import AdvancedSEOOptimizer
-        
-        optimizer = AdvancedSEOOptimizer()
+    AdvancedSEOOptimizer = _load_module('seo_optimizer').AdvancedSEOOptimizer
+    
+    optimizer = AdvancedSEOOptimizer()
+    
+    # Test cases
+    test_cases = [
+        {
+            'name': 'Web Content',
+            'text': 'Nuestro sitio web www.ejemplo.com ofrece servicios de SEO y optimización para motores de búsqueda que ayudan a mejorar la visibilidad online y posicionamiento.',
+            'keywords': ['SEO', 'optimización', 'posicionamiento']
+        },
+        {
+            'name': 'Blog Article',
+            'text': 'Cómo mejorar el posicionamiento web: guía completa. El SEO es fundamental para cualquier sitio web que busque visibilidad en buscadores como Google.',
+            'keywords': ['posicionamiento web', 'SEO', 'Google']
+        }
+    ]
+    
+    for test_case in test_cases:
+        print(f"📝 {test_case['name']}:")
         
-        # Test cases
-        test_cases = [
-            {
-                'name': 'Web Content',
-                'text': 'Nuestro sitio web www.ejemplo.com ofrece servicios de SEO y optimización para motores de búsqueda que ayudan a mejorar la visibilidad online y posicionamiento.',
-                'keywords': ['SEO', 'optimización', 'posicionamiento']
-            },
-            {
-                'name': 'Blog Article',
-                'text': 'Cómo mejorar el posicionamiento web: guía completa. El SEO es fundamental para cualquier sitio web que busque visibilidad en buscadores como Google.',
-                'keywords': ['posicionamiento web', 'SEO', 'Google']
-            }
-        ]
+        analysis = optimizer.analyze_seo_comprehensive(
+            test_case['text'], 
+            test_case['keywords']
+        )
         
-        for test_case in test_cases:
-            print(f"📝 {test_case['name']}:")
-            
-            analysis = optimizer.analyze_seo_comprehensive(
-                test_case['text'], 
-                test_case['keywords']
-            )
-            
-            print(f"   📊 SEO Score: {analysis['seo_score']['overall']:.1%}")
-            print(f"   📖 Readability: {analysis['readability_seo']['seo_readability']}")
-            print(f"   🔑 Keywords analyzed: {len(analysis['keyword_analysis']['target_keywords'])}")
-            print(f"   💡 Recommendations: {len(analysis['recommendations'])}")
-            
-            # Test optimization suggestions
-            optimizations = optimizer.optimize_for_seo(
-                test_case['text'], 
-                test_case['keywords']
-            )
-            
-            print(f"   🎯 Title suggestions: {len(optimizations['optimizations']['title_suggestions'])}")
-            print(f"   📄 Meta descriptions: {len(optimizations['optimizations']['meta_description_suggestions'])}")
-            print()
+        print(f"   📊 SEO Score: {analysis['seo_score']['overall']:.1%}")
+        print(f"   📖 Readability: {analysis['readability_seo']['seo_readability']}")
+        print(f"   🔑 Keywords analyzed: {len(analysis['keyword_analysis']['target_keywords'])}")
+        print(f"   💡 Recommendations: {len(analysis['recommendations'])}")
         
-        print("✅ Advanced SEO optimizer working!")
-        return True
+        # Test optimization suggestions
+        optimizations = optimizer.optimize_for_seo(
+            test_case['text'], 
+            test_case['keywords']
+        )
         
-    except Exception as e:
-        print(f"❌ Error in SEO testing: {e}")
-        return False
+        print(f"   🎯 Title suggestions: {len(optimizations['optimizations']['title_suggestions'])}")
+        print(f"   📄 Meta descriptions: {len(optimizations['optimizations']['meta_description_suggestions'])}")
+        print()
+    
+    print("✅ Advanced SEO optimizer working!")
+    return True
+
+def _fake_sentence_encoder(text, dimensions=32):
+    """Deterministic stand-in for the sentence model: unit bag-of-words vector
+    that ignores case and punctuation"""
+    vector = [0.0] * dimensions
+    for word in ''.join(c if c.isalnum() else ' ' for c in text.lower()).split():
+        vector[sum(map(ord, word)) % dimensions] += 1.0
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    return [v / norm for v in vector]
 
 def test_performance_optimization():
     """Test performance optimization and caching"""
     print("⚡ Testing Performance Optimization")
     print("-" * 50)
     
-    try:
-        from agent_coordinator import AgentCoordinator
-        from performance_optimizer import PerformanceOptimizer, OptimizedAgentCoordinator
-        
-        # Initialize components
-        base_coordinator = AgentCoordinator(use_knowledge_base=True)
-        performance_optimizer = PerformanceOptimizer()
-        
-        # Test caching
-        @performance_optimizer.cached(ttl=300)
-        def dummy_processing(text):
-            time.sleep(0.1)  # Simulate processing
-            return f"processed: {text}"
-        
-        # Test cache performance
-        test_text = "Test text for caching"
-        
-        # First call (should be slow)
-        start = time.time()
-        result1 = dummy_processing(test_text)
-        time1 = time.time() - start
-        
-        # Second call (should be fast - cached)
-        start = time.time()
-        result2 = dummy_processing(test_text)
-        time2 = time.time() - start
-        
-        print(f"   ⏱ First call: {time1:.3f}s")
-        print(f"   ⚡ Cached call: {time2:.3f}s")
-        print(f"   🚀 Speed improvement: {time1/time2:.1f}x")
-        
-        # Test optimized coordinator
-        optimized_coordinator = OptimizedAgentCoordinator(base_coordinator, performance_optimizer)
-        
-        texts = [
-            "Este es un texto de prueba.",
-            "Otro texto similar para testing.",
-            "Texto final de la prueba."
-        ]
-        
-        start = time.time()
-        results = optimized_coordinator.process_multiple_texts(texts)
-        batch_time = time.time() - start
-        
-        print(f"   📊 Batch processing: {len(texts)} texts in {batch_time:.1f}s")
-        print(f"   📈 Performance stats available: ✅")
-        
-        # Get performance report
-        report = performance_optimizer.get_performance_report()
-        print(f"   💾 Cache hits: {report['cache_stats']['hits']}")
-        print(f"   📊 Hit rate: {report['cache_stats']['hit_rate']:.1%}")
-        
-        print("✅ Performance optimization working!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error in performance testing: {e}")
-        return False
+    PerformanceOptimizer = _load_module('performance_optimizer').PerformanceOptimizer
+    OptimizedAgentCoordinator = _load_module('performance_optimizer').OptimizedAgentCoordinator
+    
+    # Initialize components; the optimizer patches the agents it wraps. The
+    # stand-in encoder keeps the semantic checks independent of the model
+    base_coordinator = _new_coordinator()
+    performance_optimizer = PerformanceOptimizer(semantic_encoder=_fake_sentence_encoder)
+    
+    # Test caching
+    @performance_optimizer.cached(ttl=300)
+    def dummy_processing(text):
+        time.sleep(0.1)  # Simulate processing
+        return f"processed: {text}"
+    
+    # Test cache performance
+    test_text = "Test text for caching"
+    
+    # First call (should be slow)
+    start = perf_counter_ns()
+    result1 = dummy_processing(test_text)
+    time1_ns = perf_counter_ns() - start
+    
+    # Second call (should be fast - cached)
+    start = perf_counter_ns()
+    result2 = dummy_processing(test_text)
+    time2_ns = perf_counter_ns() - start
+    
+    print(f"   ⏱ First call: {time1_ns / NS_PER_SECOND:.3f}s")
+    print(f"   ⚡ Cached call: {time2_ns / NS_PER_SECOND:.6f}s")
+    print(f"   🚀 Speed improvement: {time1_ns / max(time2_ns, 1):.1f}x")
+    
+    # Test semantic caching: a near-duplicate text reuses the first result
+    @performance_optimizer.cached(ttl=300, semantic=True)
+    def dummy_correction(text):
+        time.sleep(0.1)  # Simulate processing
+        return f"corrected: {text}"
+    
+    first = dummy_correction("Este es un texto de prueba.")
+    assert dummy_correction("Este es un texto de prueba") == first
+    assert dummy_correction("Los gatos duermen al sol") != first
+    semantic_stats = performance_optimizer.get_performance_report()['semantic_cache_stats']
+    print(f"   🧠 Semantic cache hits: {semantic_stats['hits']}/{semantic_stats['total_requests']}")
+    assert (semantic_stats['hits'], semantic_stats['misses']) == (1, 2)
+    
+    # Test optimized coordinator
+    optimized_coordinator = OptimizedAgentCoordinator(base_coordinator, performance_optimizer)
+    
+    texts = [
+        "Este es un texto de prueba.",
+        "Otro texto similar para testing.",
+        "Texto final de la prueba."
+    ]
+    
+    start = perf_counter_ns()
+    results = optimized_coordinator.process_multiple_texts(texts, executor=_EXECUTOR)
+    batch_time = (perf_counter_ns() - start) / NS_PER_SECOND
+    
+    print(f"   📊 Batch processing: {len(texts)} texts in {batch_time:.1f}s")
+    print(f"   📈 Performance stats available: ✅")
+    
+    # Get performance report
+    report = performance_optimizer.get_performance_report()
+    print(f"   💾 Cache hits: {report['cache_stats']['hits']}")
+    print(f"   📊 Hit rate: {report['cache_stats']['hit_rate']:.1%}")
+    
+    print("✅ Performance optimization working!")
+    return True
 
 def test_user_feedback_system():
     """Test user feedback integration"""
     print("👥 Testing User Feedback System")
     print("-" * 50)
     
-    try:
-        from agent_coordinator import AgentCoordinator
-        from feedback_system import UserFeedbackManager, FeedbackIntegratedCoordinator
-        
-        # Initialize components
-        base_coordinator = AgentCoordinator(use_knowledge_base=True)
-        feedback_manager = UserFeedbackManager("test_feedback.json")
-        
-        # Generate test feedback data
-        feedback_manager.simulate_feedback_data(20)
-        
-        # Test feedback analysis
-        analytics = feedback_manager.analyze_feedback()
-        
-        print(f"   📊 Total feedback: {analytics.total_feedback}")
-        print(f"   ⭐ Average rating: {analytics.average_rating:.1f}/5")
-        print(f"   😊 Satisfaction rate: {analytics.user_satisfaction_trend}")
-        print(f"   🤖 Agent performance tracked: {len(analytics.agent_performance)}")
-        
-        # Test integrated coordinator
-        integrated_coordinator = FeedbackIntegratedCoordinator(base_coordinator, feedback_manager)
-        
-        test_text = "Este es un texto de prueba para el sistema de feedback."
-        results = integrated_coordinator.process_text_with_feedback(test_text)
-        
-        print(f"   🎯 Feedback prompts generated: ✅")
-        print(f"   📝 Ready for user feedback: {results.get('ready_for_feedback', False)}")
-        
-        # Test feedback submission
-        feedback_id = integrated_coordinator.submit_user_feedback(
-            results, 4.5, 'praise', 'Excelente corrección!'
-        )
-        
-        print(f"   📤 Feedback submitted: {feedback_id[:8]}...")
-        
-        # Get improvement insights
-        insights = integrated_coordinator.get_improvement_insights()
-        print(f"   💡 System health: {insights['system_health']['satisfaction_level']}")
-        
-        print("✅ User feedback system working!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error in feedback testing: {e}")
-        return False
+    UserFeedbackManager = _load_module('feedback_system').UserFeedbackManager
+    FeedbackIntegratedCoordinator = _load_module('feedback_system').FeedbackIntegratedCoordinator
+    
+    # Initialize components
+    base_coordinator = _get_coordinator()
+    feedback_manager = UserFeedbackManager("test_feedback.jsonl")
+    
+    # Generate test feedback data
+    feedback_manager.simulate_feedback_data(20)
+    
+    # Test feedback analysis
+    analytics = feedback_manager.analyze_feedback()
+    
+    print(f"   📊 Total feedback: {analytics.total_feedback}")
+    print(f"   ⭐ Average rating: {analytics.average_rating:.1f}/5")
+    print(f"   😊 Satisfaction rate: {analytics.user_satisfaction_trend}")
+    print(f"   🤖 Agent performance tracked: {len(analytics.agent_performance)}")
+    
+    # Test integrated coordinator
+    integrated_coordinator = FeedbackIntegratedCoordinator(base_coordinator, feedback_manager)
+    
+    test_text = "Este es un texto de prueba para el sistema de feedback."
+    results = integrated_coordinator.process_text_with_feedback(test_text)
+    
+    print(f"   🎯 Feedback prompts generated: ✅")
+    print(f"   📝 Ready for user feedback: {results.get('ready_for_feedback', False)}")
+    
+    # Test feedback submission
+    feedback_id = integrated_coordinator.submit_user_feedback(
+        results, 4.5, 'praise', 'Excelente corrección!'
+    )
+    
+    print(f"   📤 Feedback submitted: {feedback_id[:8]}...")
+    
+    # Get improvement insights
+    insights = integrated_coordinator.get_improvement_insights()
+    print(f"   💡 System health: {insights['system_health']['satisfaction_level']}")
+    
+    print("✅ User feedback system working!")
+    return True
 
 def test_quality_convergence():
     """Test quality convergence detection"""
     print("🎯 Testing Quality Convergence Detection")
     print("-" * 50)
     
-    try:
-        from quality_analyzer import QualityAnalyzer, ConvergenceDetector
-        from agent_coordinator import AgentCoordinator
-        
-        # Initialize components
-        analyzer = QualityAnalyzer()
-        detector = ConvergenceDetector()
-        coordinator = AgentCoordinator(use_knowledge_base=True)
-        
-        # Test quality analysis
-        test_texts = [
-            "Este texto tiene algunos errores que que necesitan corrección.",  # Low quality
-            "Este texto tiene algunos errores que necesitan corrección.",      # Medium quality
-            "Este texto tiene buena estructura y claridad.",                   # High quality
-        ]
-        
-        print("📊 Quality Analysis:")
-        for i, text in enumerate(test_texts, 1):
-            # Process text
-            results = coordinator.process_text(text)
-            
-            # Analyze quality
-            quality = analyzer.analyze_comprehensive_quality(text, results)
-            
-            print(f"   Text {i}: Overall={quality.overall_quality:.1%}, "
-                  f"Readability={quality.readability_score:.1%}, "
-                  f"Grammar={quality.grammar_accuracy:.1%}")
-            
-            # Add to convergence detector
-            detector.add_processing_result(text, results)
-        
-        # Test convergence detection
-        convergence = detector.check_convergence()
-        trend = detector.get_quality_trend()
-        
-        print(f"   🔄 Convergence status: {convergence.get('converged', False)}")
-        print(f"   📈 Quality trend: {trend['direction']}")
-        print(f"   📊 Data points: {trend['data_points']}")
+    QualityAnalyzer = _load_module('quality_analyzer').QualityAnalyzer
+    ConvergenceDetector = _load_module('quality_analyzer').ConvergenceDetector
+    
+    # Initialize components
+    analyzer = QualityAnalyzer()
+    detector = ConvergenceDetector()
+    coordinator = _get_coordinator()
+    
+    # Test quality analysis
+    test_texts = [
+        "Este texto tiene algunos errores que que necesitan corrección.",  # Low quality
+        "Este texto tiene algunos errores que necesitan corrección.",      # Medium quality
+        "Este texto tiene buena estructura y claridad.",                   # High quality
+    ]
+    
+    print("📊 Quality Analysis:")
+    for i, text in enumerate(test_texts, 1):
+        # Process text
+        results = coordinator.process_text(text)
         
-        # Get detailed analysis
-        detailed = detector.get_detailed_analysis()
-        if detailed['status'] == 'analyzed':
-            print(f"   ⭐ Current quality: {detailed['current_metrics']['overall_quality']:.1%}")
-            print(f"   🎯 Recommendations: {len(detailed['recommendations'])}")
+        # Analyze quality
+        quality = analyzer.analyze_comprehensive_quality(text, results)
         
-        print("✅ Quality convergence detection working!")
-        return True
+        print(f"   Text {i}: Overall={quality.overall_quality:.1%}, "
+              f"Readability={quality.readability_score:.1%}, "
+              f"Grammar={quality.grammar_accuracy:.1%}")
         
-    except Exception as e:
-        print(f"❌ Error in convergence testing: {e}")
-        return False
+        # Add to convergence detector, reusing the analysis above
+        detector.add_processing_result(text, results, quality)
+    
+    # Test convergence detection
+    convergence = detector.check_convergence()
+    trend = detector.get_quality_trend()
+    
+    print(f"   🔄 Convergence status: {convergence.get('converged', False)}")
+    print(f"   📈 Quality trend: {trend['direction']}")
+    print(f"   📊 Data points: {trend['data_points']}")
+    
+    # Get detailed analysis
+    detailed = detector.get_detailed_analysis()
+    if detailed['status'] == 'analyzed':
+        print(f"   ⭐ Current quality: {detailed['current_metrics']['overall_quality']:.1%}")
+        print(f"   🎯 Recommendations: {len(detailed['recommendations'])}")
+    
+    print("✅ Quality convergence detection working!")
+    return True
 
 def test_advanced_analytics():
     """Test advanced analytics and dashboard"""
     print("📊 Testing Advanced Analytics Dashboard")
     print("-" * 50)
     
-    try:
-        from analytics_dashboard import AdvancedAnalytics, AnalyticsIntegratedSystem
-        from agent_coordinator import AgentCoordinator
-        
-        # Initialize components
-        base_coordinator = AgentCoordinator(use_knowledge_base=True)
-        analytics_system = AnalyticsIntegratedSystem(base_coordinator)
-        
-        # Generate test data
-        test_texts = [
-            "Texto corto para prueba.",
-            "Este es un texto más largo que necesita análisis de estilo y gramática.",
-            "Contenido web para SEO: optimización, posicionamiento y visibilidad online.",
-            "Documento formal con estructura clara y vocabulario apropiado."
-        ]
-        
-        print("📈 Processing texts for analytics:")
-        for i, text in enumerate(test_texts, 1):
-            results = analytics_system.process_with_analytics(text)
-            print(f"   Text {i}: Processed in {results['analytics']['processing_time']:.2f}s")
-            
-            # Simulate user feedback for some texts
-            if i % 2 == 0:
-                feedback = {
-                    'rating': 4.5 if i == 2 else 3.5,
-                    'feedback_type': 'praise',
-                    'comment': 'Muy útil' if i == 2 else 'Aceptable'
-                }
-                analytics_system.submit_feedback_with_analytics(results, feedback)
-        
-        # Get dashboard data
-        dashboard = analytics_system.get_analytics_dashboard()
-        
-        print("📊 Dashboard Metrics:")
-        summary = dashboard['summary']
-        print(f"   📝 Total requests: {summary['total_requests']}")
-        print(f"   ⭐ Average quality: {summary['avg_quality']:.1%}")
-        print(f"   😊 User satisfaction: {summary['user_satisfaction']:.1%}")
-        print(f"   🩺 System health: {summary['system_health']}")
-        
-        # Show insights
-        insights = dashboard['insights']
-        print(f"   💡 Generated insights: {len(insights)}")
-        
-        if insights:
-            top_insight = insights[0]
-            print(f"   🔍 Top insight: {top_insight['title']}")
-        
-        # Show recommendations
-        recommendations = dashboard['recommendations']
-        print(f"   🎯 Recommendations: {len(recommendations)}")
-        
-        if recommendations:
-            print(f"   📋 Top recommendation: {recommendations[0]}")
-        
-        print("✅ Advanced analytics working!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error in analytics testing: {e}")
-        return False
+    AdvancedAnalytics = _load_module('analytics_dashboard').AdvancedAnalytics
+    AnalyticsIntegratedSystem = _load_module('analytics_dashboard').AnalyticsIntegratedSystem
+    
+    # Initialize components
+    base_coordinator = _get_coordinator()
+    analytics_system = AnalyticsIntegratedSystem(base_coordinator)
+    
+    # Generate test data
+    test_texts = [
+        "Texto corto para prueba.",
+        "Este es un texto más largo que necesita análisis de estilo y gramática.",
+        "Contenido web para SEO: optimización, posicionamiento y visibilidad online.",
+        "Documento formal con estructura clara y vocabulario apropiado."
+    ]
+    
+    print("📈 Processing texts for analytics:")
+    for i, text in enumerate(test_texts, 1):
+        results = analytics_system.process_with_analytics(text)
+        print(f"   Text {i}: Processed in {results['analytics']['processing_time']:.2f}s")
+        
+        # Simulate user feedback for some texts
+        if i % 2 == 0:
+            feedback = {
+                'rating': 4.5 if i == 2 else 3.5,
+                'feedback_type': 'praise',
+                'comment': 'Muy útil' if i == 2 else 'Aceptable'
+            }
+            analytics_system.submit_feedback_with_analytics(results, feedback)
+    
+    # Get dashboard data
+    dashboard = analytics_system.get_analytics_dashboard()
+    
+    print("📊 Dashboard Metrics:")
+    summary = dashboard['summary']
+    print(f"   📝 Total requests: {summary['total_requests']}")
+    print(f"   ⭐ Average quality: {summary['avg_quality']:.1%}")
+    print(f"   😊 User satisfaction: {summary['user_satisfaction']:.1%}")
+    print(f"   🩺 System health: {summary['system_health']}")
+    
+    # Show insights
+    insights = dashboard['insights']
+    print(f"   💡 Generated insights: {len(insights)}")
+    
+    if insights:
+        top_insight = insights[0]
+        print(f"   🔍 Top insight: {top_insight['title']}")
+    
+    # Show recommendations
+    recommendations = dashboard['recommendations']
+    print(f"   🎯 Recommendations: {len(recommendations)}")
+    
+    if recommendations:
+        print(f"   📋 Top recommendation: {recommendations[0]}")
+    
+    print("✅ Advanced analytics working!")
+    return True
 
 def test_integrated_phase4_system():
     """Test complete Phase 4 integrated system"""
     print("🚀 Testing Complete Phase 4 Integration")
     print("=" * 60)
     
-    try:
-        from agent_coordinator import AgentCoordinator
-        from multi_pass_processor import MultiPassProcessor
-        from performance_optimizer import PerformanceOptimizer
-        from feedback_system import UserFeedbackManager
-        from quality_analyzer import ConvergenceDetector
-        from analytics_dashboard import AdvancedAnalytics
-        
-        print("🔧 Initializing integrated system...")
-        
-        # Initialize all components
-        base_coordinator = AgentCoordinator(use_knowledge_base=True)
-        multi_pass_processor = MultiPassProcessor(base_coordinator, max_passes=3)
-        performance_optimizer = PerformanceOptimizer()
-        feedback_manager = UserFeedbackManager("integrated_test_feedback.json")
-        convergence_detector = ConvergenceDetector()
-        analytics = AdvancedAnalytics("integrated_test_analytics.json")
-        
-        print("✅ All components initialized")
-        
-        # Optimize performance
-        performance_optimizer.optimize_agent_coordination(base_coordinator)
-        
-        # Test complex processing workflow
-        complex_text = """
-        La implementación de sistemas de inteligencia artificial en el ámbito empresarial que que 
-        requiere una planificación estratégica cuidadosa y detallada que debe contemplar múltiples 
-        factores organizacionales, tecnológicos y humanos para garantizar el éxito del proyecto 
-        y maximizar el retorno de inversión esperado por los stakeholders involucrados.
-        """
-        
-        print(f"📝 Processing complex text ({len(complex_text.split())} words)...")
-        
-        # Multi-pass processing with all features
-        start_time = time.time()
-        
-        # Step 1: Multi-pass refinement
-        multi_pass_results = multi_pass_processor.process_with_multiple_passes(
-            complex_text.strip(),
-            user_preferences={'mode': 'balanced'}
-        )
-        
-        processing_time = time.time() - start_time
-        
-        # Step 2: Quality analysis and convergence detection
-        final_text = multi_pass_results['final_text']
-        convergence_detector.add_processing_result(final_text, multi_pass_results)
-        convergence_status = convergence_detector.check_convergence()
-        
-        # Step 3: Record analytics
-        session_id = str(uuid.uuid4())
-        analytics.record_processing_event(
-            session_id=session_id,
-            text_input=complex_text.strip(),
-            results=multi_pass_results,
-            processing_time=processing_time
-        )
-        
-        # Results summary
-        print("\n🎯 PHASE 4 INTEGRATION RESULTS:")
-        print("=" * 40)
-        
-        overall_metrics = multi_pass_results['overall_metrics']
-        print(f"📊 Processing Summary:")
-        print(f"   • Passes completed: {overall_metrics['total_passes']}")
-        print(f"   • Total processing time: {overall_metrics['total_time']:.1f}s")
-        print(f"   • Quality improvement: {overall_metrics['initial_quality']:.1%} → {overall_metrics['final_quality']:.1%}")
-        print(f"   • Total improvements: {overall_metrics['total_improvements']}")
-        print(f"   • Convergence achieved: {overall_metrics['convergence_achieved']}")
-        
-        print(f"\n🔄 Convergence Analysis:")
-        print(f"   • Status: {'✅ Converged' if convergence_status['converged'] else '🔄 Continuing'}")
-        print(f"   • Reason: {convergence_status['reason']}")
-        print(f"   • Confidence: {convergence_status['confidence']:.1%}")
-        print(f"   • Recommendation: {convergence_status['recommendation']}")
-        
-        print(f"\n⚡ Performance Metrics:")
-        perf_report = performance_optimizer.get_performance_report()
-        print(f"   • Cache hit rate: {perf_report['cache_stats']['hit_rate']:.1%}")
-        print(f"   • Average processing time: {perf_report['processing_stats']['avg_time']:.2f}s")
-        print(f"   • Total cached functions: {perf_report['cache_stats']['size']}")
-        
-        print(f"\n📈 System Health:")
-        dashboard_data = analytics.get_dashboard_data()
-        health = dashboard_data['summary']['system_health']
-        print(f"   • Overall health: {health}")
-        print(f"   • Total requests processed: {dashboard_data['summary']['total_requests']}")
-        
-        print(f"\n🎉 PHASE 4 FULLY INTEGRATED AND OPERATIONAL!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error in integrated system testing: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    MultiPassProcessor = _load_module('multi_pass_processor').MultiPassProcessor
+    PerformanceOptimizer = _load_module('performance_optimizer').PerformanceOptimizer
+    UserFeedbackManager = _load_module('feedback_system').UserFeedbackManager
+    ConvergenceDetector = _load_module('quality_analyzer').ConvergenceDetector
+    AdvancedAnalytics = _load_module('analytics_dashboard').AdvancedAnalytics
+    
+    print("🔧 Initializing integrated system...")
+    
+    # Initialize all components; the optimizer patches the agents below
+    base_coordinator = _new_coordinator()
+    multi_pass_processor = MultiPassProcessor(base_coordinator, max_passes=3)
+    performance_optimizer = PerformanceOptimizer()
+    feedback_manager = UserFeedbackManager("integrated_test_feedback.jsonl")
+    convergence_detector = ConvergenceDetector()
+    analytics = AdvancedAnalytics("integrated_test_analytics.jsonl")
+    
+    print("✅ All components initialized")
+    
+    # Optimize performance
+    performance_optimizer.optimize_agent_coordination(base_coordinator)
+    
+    # Test complex processing workflow
+    complex_text = """
+    La implementación de sistemas de inteligencia artificial en el ámbito empresarial que que 
+    requiere una planificación estratégica cuidadosa y detallada que debe contemplar múltiples 
+    factores organizacionales, tecnológicos y humanos para garantizar el éxito del proyecto 
+    y maximizar el retorno de inversión esperado por los stakeholders involucrados.
+    """
+    
+    print(f"📝 Processing complex text ({len(complex_text.split())} words)...")
+    
+    # Multi-pass processing with all features
+    start_ns = perf_counter_ns()
+    
+    # Step 1: Multi-pass refinement
+    multi_pass_results = multi_pass_processor.process_with_multiple_passes(
+        complex_text.strip(),
+        user_preferences={'mode': 'balanced'}
+    )
+    
+    processing_time = (perf_counter_ns() - start_ns) / NS_PER_SECOND
+    
+    # Step 2: Quality analysis and convergence detection
+    final_text = multi_pass_results['final_text']
+    convergence_detector.add_processing_result(final_text, multi_pass_results)
+    convergence_status = convergence_detector.check_convergence()
+    
+    # Step 3: Record analytics
+    session_id = secrets.token_hex(8)
+    analytics.record_processing_event(
+        session_id=session_id,
+        text_input=complex_text.strip(),
+        results=multi_pass_results,
+        processing_time=processing_time
+    )
+    
+    # Results summary
+    print("\n🎯 PHASE 4 INTEGRATION RESULTS:")
+    print("=" * 40)
+    
+    overall_metrics = multi_pass_results['overall_metrics']
+    print(f"📊 Processing Summary:")
+    print(f"   • Passes completed: {overall_metrics['total_passes']}")
+    print(f"   • Total processing time: {overall_metrics['total_time']:.1f}s")
+    print(f"   • Quality improvement: {overall_metrics['initial_quality']:.1%} → {overall_metrics['final_quality']:.1%}")
+    print(f"   • Total improvements: {overall_metrics['total_improvements']}")
+    print(f"   • Convergence achieved: {overall_metrics['convergence_achieved']}")
+    
+    print(f"\n🔄 Convergence Analysis:")
+    print(f"   • Status: {'✅ Converged' if convergence_status['converged'] else '🔄 Continuing'}")
+    print(f"   • Reason: {convergence_status['reason']}")
+    print(f"   • Confidence: {convergence_status['confidence']:.1%}")
+    print(f"   • Recommendation: {convergence_status['recommendation']}")
+    
+    print(f"\n⚡ Performance Metrics:")
+    perf_report = performance_optimizer.get_performance_report()
+    print(f"   • Cache hit rate: {perf_report['cache_stats']['hit_rate']:.1%}")
+    print(f"   • Average processing time: {perf_report['processing_stats']['avg_time']:.2f}s")
+    print(f"   • Total cached functions: {perf_report['cache_stats']['size']}")
+    
+    print(f"\n📈 System Health:")
+    dashboard_data = analytics.get_dashboard_data()
+    health = dashboard_data['summary']['system_health']
+    print(f"   • Overall health: {health}")
+    print(f"   • Total requests processed: {dashboard_data['summary']['total_requests']}")
+    
+    print(f"\n🎉 PHASE 4 FULLY INTEGRATED AND OPERATIONAL!")
+    return True
 
 def run_comprehensive_phase4_tests():
     """Run all Phase 4 tests"""
@@ -462,27 +558,58 @@ def run_comprehensive_phase4_tests():
         ("Integrated System", test_integrated_phase4_system)
     ]
     
+    # Import the modules and build the shared coordinator before the tests
+    # fan out to threads
+    for module_name in PHASE4_MODULES:
+        try:
+            _load_module(module_name)
+        except unittest.SkipTest:
+            pass  # Each test that needs the module reports the skip itself
+    try:
+        _get_coordinator()
+    except Exception:
+        pass  # Each test reports the failure itself
+    
+    # The tests are independent, so they run concurrently and wall-clock time
+    # follows the slowest one; each test's output, including output from batch
+    # work it hands to the pool, is buffered and replayed in order. At least
+    # two workers, so a test waiting on its own batch never blocks the pool
+    global _EXECUTOR
+    stdout = _ThreadBufferedStdout(sys.stdout)
+    _EXECUTOR = _BufferedThreadPoolExecutor(
+        stdout, max_workers=min(32, (os.cpu_count() or 4) * 2), thread_name_prefix='phase4'
+    )
+    sys.stdout = stdout
+    try:
+        futures = [_EXECUTOR.submit(stdout.capture, test_func) for _, test_func in tests]
+        outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout.stream
+        _EXECUTOR.shutdown(wait=True)
+        _EXECUTOR = None
+    
     passed = 0
     failed = 0
+    skipped = 0
     
-    for test_name, test_func in tests:
-        print(f"🧪 Testing: {test_name}")
-        print("=" * 60)
-        
-        try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name}: PASSED")
-            else:
-                failed += 1
-                print(f"❌ {test_name}: FAILED")
-        except Exception as e:
+    for (test_name, _), (outcome, output) in zip(tests, outcomes):
+        if isinstance(outcome, unittest.SkipTest):
+            skipped += 1
+            status = f"⏭ {test_name}: SKIPPED - {outcome}"
+        elif isinstance(outcome, Exception):
             failed += 1
-            print(f"❌ {test_name}: ERROR - {e}")
+            status = f"❌ {test_name}: ERROR - {outcome}"
+        elif outcome:
+            passed += 1
+            status = f"✅ {test_name}: PASSED"
+        else:
+            failed += 1
+            status = f"❌ {test_name}: FAILED"
         
-        print()
-        print("=" * 60)
-        print()
+        # One write per test keeps its report contiguous and avoids a flush per line
+        sys.stdout.write(
+            f"🧪 Testing: {test_name}\n{'=' * 60}\n{output}{status}\n\n{'=' * 60}\n\n"
+        )
     
     # Final summary
     total = passed + failed
@@ -492,6 +619,8 @@ def run_comprehensive_phase4_tests():
     print("=" * 40)
     print(f"✅ Passed: {passed}/{total}")
     print(f"❌ Failed: {failed}/{total}")
+    if skipped:
+        print(f"⏭ Skipped: {skipped}")
     print(f"📊 Success Rate: {success_rate:.1f}%")
     print()
     
@@ -508,6 +637,8 @@ def run_comprehensive_phase4_tests():
     return success_rate >= 80
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if "--verbose" in sys.argv[1:] else logging.INFO)
+    
     success = run_comprehensive_phase4_tests()
     
     if success: